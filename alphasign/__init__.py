@@ -11,6 +11,29 @@ from .text import Text
 Text = Text
 from .image import Image
 Image = Image
+from .cache import ImageCache
+ImageCache = ImageCache
+from .video import Video
+Video = Video
+from .render import TextRenderer
+TextRenderer = TextRenderer
+from .layout import Layout
+Layout = Layout
+from .memory import MemoryPlan, MemoryPlanner
+MemoryPlan = MemoryPlan
+MemoryPlanner = MemoryPlanner
+from .state import SignState
+SignState = SignState
+from .playlist import Playlist
+Playlist = Playlist
+from .schedule import Schedule
+Schedule = Schedule
+from .alert import Alert
+Alert = Alert
+from .clock import ClockSync
+ClockSync = ClockSync
+from .metrics import FontMetrics
+FontMetrics = FontMetrics
 
 ## Easy classes
 from .easy import Easy
@@ -0,0 +1,68 @@
+import threading
+
+from .sign import Sign
+from .text import Text
+from .packet import Packet
+from .command import Command
+
+# Urgent messages in the priority text file, which interrupts the run sequence. Once
+# cleared (by an empty write), the sign resumes its resident files without any upload
+class Alert:
+    label = "0"
+
+    def __init__(self, sign=None, timer=threading.Timer):
+        # Sign, or the shared Sign() when None (resolved on use)
+        self._sign = sign
+
+        # Timer factory (threading.Timer interface) for TTLs
+        self.timer_factory = timer
+        self.timer = None
+
+        # Alerts shown so far, a timer only clears the alert it was started for
+        self.generation = 0
+        self.active = False
+        self.lock = threading.Lock()
+
+    @property
+    def sign(self):
+        return self._sign or Sign()
+
+    def show(self, text, ttl=None, mode=Text.Mode.rotate, position=Command.write_text.Position.fill):
+        # Show text right away, and clear it after ttl seconds (kept until cleared if None)
+        with self.lock:
+            self.cancel()
+            packet = Packet()
+            packet.add_command(Command.write_text(text, self.label, position, mode))
+            self.sign.send(packet)
+            self.generation += 1
+            self.active = True
+
+            if ttl is not None:
+                self.timer = self.timer_factory(ttl, self.expire, args=(self.generation,))
+                self.timer.daemon = True
+                self.timer.start()
+
+    def expire(self, generation):
+        # Timer callback, a newer alert has its own TTL
+        with self.lock:
+            if generation == self.generation and self.active:
+                self.send_clear()
+
+    def clear(self):
+        # Always sent: the sign may still show an alert this instance doesn't know about
+        # (eg. from before a restart)
+        with self.lock:
+            self.cancel()
+            self.send_clear()
+
+    def send_clear(self):
+        # Empty write to the priority file: back to the run sequence
+        packet = Packet()
+        packet.add_command(Command.write_text(b"", self.label, mode=None))
+        self.sign.send(packet)
+        self.active = False
+
+    def cancel(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
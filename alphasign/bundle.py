@@ -0,0 +1,191 @@
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+from PIL import Image as pimg
+from PIL import ImageSequence
+
+from .sign import Sign
+from .image import Image
+from .packet import Packet
+from .command import Command
+from .video import Video, fit_frame
+
+# Precompiled animation: fully encoded small dots packets plus frame timing, played through mmap
+#
+# Layout (little endian):
+#   header   magic "ALPHABDL", version, label, width, height, frame count, packet size
+#   timing   frame count x uint32, display time of each frame in milliseconds
+#   packets  frame count x packet size bytes, ready to send
+class Bundle:
+    header = struct.Struct("<8sBcHHII")
+    magic = b"ALPHABDL"
+    version = 1
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        self.mm = None
+        try:
+            # Short or foreign files are rejected before reading the header
+            size = os.fstat(self.file.fileno()).st_size
+            if size < self.header.size:
+                raise ValueError(f"{path} is not an alphasign bundle (too short)")
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self.mm[:len(self.magic)] != self.magic:
+                raise ValueError(f"{path} is not an alphasign bundle")
+
+            magic, version, label, self.width, self.height, self.count, self.packet_size = self.header.unpack_from(self.mm)
+            if version != self.version:
+                raise ValueError(f"{path} is not an alphasign bundle (version {self.version})")
+            self.label = label.decode()
+
+            self.offset = self.header.size + 4 * self.count
+            if size < self.offset + self.count * self.packet_size:
+                raise ValueError(f"{path} is truncated")
+            self.timing = np.frombuffer(self.mm, dtype="<u4", count=self.count, offset=self.header.size)
+        except BaseException:
+            if self.mm is not None:
+                self.mm.close()
+            self.file.close()
+            raise
+
+    @classmethod
+    def build(cls, path, frames, durations, size, label="A", dither=None, workers=None):
+        # Fit and convert all frames (in parallel), then store their packets
+        frames = [np.asarray(fit_frame(frame, size)) for frame in frames]
+        durations = list(durations)
+        if len(durations) != len(frames):
+            raise ValueError("One duration is needed per frame")
+        batch = Image.batch(frames, dither=dither, workers=workers)
+
+        packets = []
+        for image in batch:
+            packet = Packet()
+            packet.add_command(Command.write_small_dots(image, label=label))
+            packets.append(packet.to_bytes())
+
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(cls.header.pack(cls.magic, cls.version, label.encode(), batch.width, batch.height, len(packets), len(packets[0])))
+            f.write(np.asarray(durations, dtype="<u4").tobytes())
+            for packet in packets:
+                f.write(packet)
+        os.replace(tmp, path)
+
+        return cls(path)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        start = self.offset + index * self.packet_size
+        return self.mm[start:start + self.packet_size]
+
+    @property
+    def duration(self):
+        return int(self.timing.sum()) / 1000
+
+    def play(self, sign=None, text_label="A", colors="8color", loop=False, clock=time.monotonic, sleep=time.sleep):
+        # Send the stored packets on time, dropping frames when late
+        sign = sign or Sign()
+        Video(sign, label=self.label, text_label=text_label, size=(self.width, self.height),
+              colors=colors, sleep=sleep).setup()
+
+        sent = dropped = 0
+        ends = np.cumsum(self.timing) / 1000
+        while True:
+            start = clock()
+            for index in range(self.count):
+                # Drop the frame if its display time is already over
+                now = clock() - start
+                if now >= ends[index]:
+                    dropped += 1
+                    continue
+
+                sign.send(self[index])
+                sent += 1
+
+                # Hold it until the end of its display time
+                remaining = ends[index] - (clock() - start)
+                if remaining > 0:
+                    sleep(remaining)
+            if not loop:
+                return {"sent": sent, "dropped": dropped}
+
+    def close(self):
+        self.timing = None
+        self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def read_frames(path, fps=10):
+        # (frames, durations in ms) of an animated image, a directory of images or a video file
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        if os.path.isdir(path):
+            names = sorted(n for n in os.listdir(path) if not n.startswith("."))
+            frames = [pimg.open(os.path.join(path, n)).convert("RGB") for n in names]
+            return frames, [round(1000 / fps)] * len(frames)
+
+        try:
+            img = pimg.open(path)
+        except OSError:
+            # Not an image, read it as a video
+            frames = list(Video.capture(path))
+            return frames, [round(1000 / fps)] * len(frames)
+
+        frames, durations = [], []
+        for frame in ImageSequence.Iterator(img):
+            frames.append(frame.convert("RGB"))
+            durations.append(frame.info.get("duration") or round(1000 / fps))
+        return frames, durations
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build or play precompiled alphasign animation bundles')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help='Build a bundle from an animated image, a directory of images or a video')
+    build.add_argument('source', help='Animated GIF/PNG, directory of images or video file')
+    build.add_argument('output', help='Bundle file to write')
+    build.add_argument('--size', default='60x7', help='Frame size, WIDTHxHEIGHT (default: 60x7)')
+    build.add_argument('--fps', type=float, default=10, help='Frame rate when the source has no timing (default: 10)')
+    build.add_argument('--label', default='A', help='Dots file label (default: A)')
+    build.add_argument('--dither', choices=['bayer', 'floyd-steinberg', 'atkinson'], help='Dithering mode')
+    build.add_argument('--workers', type=int, help='Conversion processes (default: one per CPU)')
+
+    play = commands.add_parser('play', help='Play a bundle on a sign')
+    play.add_argument('bundle', help='Bundle file to play')
+    play.add_argument('port', help='Serial port or IP address of the sign')
+    play.add_argument('--text-label', default='A', help='Text file label showing the frames (default: A)')
+    play.add_argument('--loop', action='store_true', help='Loop forever')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        width, height = (int(x) for x in args.size.lower().split('x'))
+        frames, durations = Bundle.read_frames(args.source, args.fps)
+        with Bundle.build(args.output, frames, durations, (width, height), args.label, args.dither, args.workers) as bundle:
+            print(f"{args.output}: {len(bundle)} frames of {bundle.width}x{bundle.height}, {bundle.duration:.1f}s")
+    else:
+        sign = Sign()
+        sign.open(args.port)
+        with Bundle(args.bundle) as bundle:
+            stats = bundle.play(sign, text_label=args.text_label, loop=args.loop)
+        print(f"sent {stats['sent']} frames, dropped {stats['dropped']}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+from collections import OrderedDict
+import hashlib
+import os
+import struct
+import threading
+
+# Bounded in-memory LRU cache, safe to share between threads
+class LRUCache:
+    def __init__(self, max_size=128):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+        # Counters, for tuning max_size
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+# Persistent cache of converted images, so a known image skips decoding and quantization
+class ImageCache:
+    # Entry header: magic, width, height
+    header = struct.Struct("<4sHH")
+    magic = b"ASIC"
+
+    def __init__(self, path=None, max_size=16 * 1024 * 1024, hash_content=False):
+        # Default to the user's cache directory (XDG_CACHE_HOME on unixes)
+        if path is None:
+            base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+            path = os.path.join(base, "alphasign", "images")
+        self.path = path
+
+        # Total size (in bytes) after which least recently used entries are evicted
+        self.max_size = max_size
+
+        # Identify files by content hash instead of path+mtime+size
+        self.hash_content = hash_content
+
+        # Eviction goes down to this fraction of max_size, so it runs once per batch of puts
+        self.low_water = 0.9
+
+        # Total size of the entries, scanned on first put then kept up to date
+        self.total = None
+        self.lock = threading.Lock()
+
+    def source_id(self, path):
+        # Identity of the source file, either its content or its stat signature
+        if self.hash_content:
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 16), b""):
+                    digest.update(chunk)
+            return "sha256:" + digest.hexdigest()
+        stat = os.stat(path)
+        return f"stat:{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    def key(self, path, **params):
+        # Key over the source and every parameter that changes the conversion (size, palette, dither...)
+        parts = [self.source_id(path)] + [f"{name}={params[name]!r}" for name in sorted(params)]
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.path, key[:2], key + ".bin")
+
+    def get(self, key):
+        # Returns (width, height, conv) or None
+        entry = self.entry_path(key)
+        try:
+            with open(entry, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        # Truncated (eg. after a crash) or foreign entries are misses
+        if len(data) < self.header.size or data[:len(self.magic)] != self.magic:
+            self.remove(entry, len(data))
+            return None
+        _, width, height = self.header.unpack_from(data)
+
+        # Mark as recently used
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+
+        return width, height, data[self.header.size:]
+
+    def put(self, key, width, height, conv):
+        entry = self.entry_path(key)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+
+        # Write to a temporary file then rename, so readers never see partial entries
+        data = self.header.pack(self.magic, width, height) + conv
+        try:
+            replaced = os.path.getsize(entry)
+        except OSError:
+            replaced = 0
+        tmp = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, entry)
+
+        with self.lock:
+            if self.total is None:
+                self.total = self.size()
+            else:
+                self.total += len(data) - replaced
+            full = self.total > self.max_size
+        if full:
+            self.evict()
+
+    def entries(self):
+        # (mtime, size, path) of every entry
+        entries = []
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                if name.endswith(".bin"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def remove(self, path, size):
+        try:
+            os.remove(path)
+        except OSError:
+            return False
+        with self.lock:
+            if self.total is not None:
+                self.total -= size
+        return True
+
+    def evict(self):
+        # Remove least recently used entries until under the low water mark (rescanning
+        # also picks up entries written by other processes)
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_size * self.low_water:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        with self.lock:
+            self.total = total
+
+    def clear(self):
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self.lock:
+            self.total = 0
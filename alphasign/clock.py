@@ -0,0 +1,102 @@
+import datetime
+import time
+
+from .sign import Sign
+from .packet import Packet
+from .command import Command
+
+# Keeps the sign's clock in sync: every clock setting goes in one nested packet, and
+# the sign's time is only read back (and reset) once per interval
+class ClockSync:
+    def __init__(self, sign=None, threshold=2, interval=3600, military=True, timeout=3,
+                 now=datetime.datetime.now, clock=time.monotonic):
+        # Sign, or the shared Sign() when None (resolved on use)
+        self._sign = sign
+
+        # Drift (minutes) triggering a resync, and seconds between checks
+        self.threshold = threshold
+        self.interval = interval
+
+        # 24 hour format, and time to wait for the sign's answer
+        self.military = military
+        self.timeout = timeout
+
+        self.now = now
+        self.clock = clock
+
+        # Time of the last sync or check, None until synced
+        self.checked = None
+
+    @property
+    def sign(self):
+        return self._sign or Sign()
+
+    def packet(self, now=None):
+        # Time, day of week, date and time format, nested
+        now = now or self.now()
+        packet = Packet()
+
+        command = Command.write_special_functions()
+        command.set_time_of_day(now.hour, now.minute)
+        packet.add_command(command)
+
+        command = Command.write_special_functions()
+        command.set_day_of_week(now.strftime("%A").lower())
+        packet.add_command(command)
+
+        command = Command.write_special_functions()
+        command.set_date(now.month, now.day, now.year)
+        packet.add_command(command)
+
+        command = Command.write_special_functions()
+        command.set_time_format("military" if self.military else "standard")
+        packet.add_command(command)
+
+        return packet
+
+    def sync(self):
+        self.sign.send(self.packet())
+        self.checked = self.clock()
+
+    def read_time(self):
+        # (hours, minutes) of the sign's clock, None if it doesn't answer
+        packet = Packet()
+        command = Command.read_special_functions()
+        command.read_time_of_day()
+        packet.add_command(command)
+        response = self.sign.request(packet, self.timeout)
+        if response is None or not response.commands:
+            return None
+        try:
+            return Command.read_special_functions.parse_time_of_day(response.commands[0].to_bytes())
+        except ValueError:
+            return None
+
+    def drift(self):
+        # Minutes between the sign's clock and ours (shortest way around midnight), None if unknown
+        sign_time = self.read_time()
+        if sign_time is None:
+            return None
+        now = self.now()
+        drift = (sign_time[0] * 60 + sign_time[1]) - (now.hour * 60 + now.minute)
+        return (drift + 720) % 1440 - 720
+
+    def check(self):
+        # Cheap to call often: syncs first, then reads the clock back once per interval
+        # and resyncs when it drifted (or didn't answer). Returns whether it synced
+        if self.checked is None:
+            self.sync()
+            return True
+        if self.clock() - self.checked < self.interval:
+            return False
+
+        drift = self.drift()
+        if drift is None or abs(drift) >= self.threshold:
+            self.sync()
+            return True
+        self.checked = self.clock()
+        return False
+
+    def forget(self):
+        # Sign clock unknown (eg. after a reset), sync on the next check
+        self.checked = None
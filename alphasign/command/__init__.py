@@ -1,9 +1,15 @@
 from .write_text import WriteText
 from .write_small_dots import WriteSmallDots
 from .write_special_functions import WriteSpecialFunctions
+from .write_string import WriteString
+from .read_special_functions import ReadSpecialFunctions
+from .read_file import ReadFile
 
 # just a list of commands as attributes
 class Command:
     write_text = WriteText
     write_small_dots = WriteSmallDots
     write_special_functions = WriteSpecialFunctions
+    write_string = WriteString
+    read_special_functions = ReadSpecialFunctions
+    read_file = ReadFile
@@ -0,0 +1,13 @@
+# Read TEXT, STRING or SMALL DOTS file commands, the sign answers with the matching write command
+class ReadFile:
+    codes = { "text": b"B", "string": b"H", "dots": b"J" }
+
+    def __init__(self, label="A", type="text"):
+        self.code = self.codes[type]
+        self.label = label
+
+        # Checksum?
+        self.checksum = False
+
+    def to_bytes(self):
+        return self.label.encode()
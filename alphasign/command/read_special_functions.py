@@ -0,0 +1,58 @@
+# Read Special Functions command, the sign answers with a Write Special Functions ("E") packet
+class ReadSpecialFunctions:
+    code = b"F"
+
+    def __init__(self, label=b""):
+        self.label = label
+
+        # Checksum?
+        self.checksum = False
+
+    # Each special function has it's own function here
+    def read_time_of_day(self):
+        self.label = b"\x20"
+
+    def read_memory_size(self):
+        self.label = b"\x23"
+
+    def read_memory_config(self):
+        self.label = b"\x24"
+
+    def read_error_register(self):
+        self.label = b"\x2A"
+
+    def to_bytes(self):
+        return self.label
+
+    # Responses: data of the "E" command, starting with the function label
+    @staticmethod
+    def parse_memory_size(data):
+        # Free memory in bytes, as hex
+        if data[:1] != b"\x23":
+            raise ValueError(f"Not a memory size response: {data!r}")
+        return int(data[1:], 16)
+
+    @staticmethod
+    def parse_time_of_day(data):
+        # (hours, minutes)
+        if data[:1] != b"\x20" or len(data) < 5:
+            raise ValueError(f"Not a time of day response: {data!r}")
+        return int(data[1:3]), int(data[3:5])
+
+    @staticmethod
+    def parse_memory_config(data):
+        # List of (label, type, ir, size, conf), size being (width, height) for dots
+        if data[:1] != b"\x24":
+            raise ValueError(f"Not a memory config response: {data!r}")
+        types = { b"\x41": "text", b"\x42": "string", b"\x43": "dots" }
+        keys = { b"\x55": "unlocked", b"\x4C": "locked" }
+
+        configs = []
+        for i in range(1, len(data) - 10, 11):
+            entry = data[i:i + 11]
+            type = types.get(entry[1:2])
+            size = int(entry[3:7], 16)
+            if type == "dots":
+                size = (size & 0xFF, size >> 8)
+            configs.append((entry[:1].decode(), type, keys.get(entry[2:3]), size, entry[7:11].decode()))
+        return configs
@@ -69,6 +69,10 @@ class WriteSpecialFunctions:
         }
         self.data = days.get(day, b"\x32")
 
+    def set_date(self, month, day, year):
+        self.label = b"\x3B"
+        self.data = f"{month:02d}{day:02d}{year % 100:02d}".encode()
+
     def set_time_format(self, format):
         self.label = b"\x27"
         self.data = b"M" if format == "military" else b"S"
@@ -80,9 +84,17 @@ class WriteSpecialFunctions:
             self.data += f"{freq:02X}{duration:1X}{repeat:1X}".encode()
 
     def set_run_time_table(self, label, start, stop):
+        # Times are hex tens of minutes since midnight ("00"-"8F"),
+        # or "FD" (all day), "FE" (never), "FF" (always)
         self.label = b"\x29"
         self.data = label + start + stop
 
+    def set_run_day_table(self, label, start, stop):
+        # Days are "0" (daily), "1"-"7" (sunday-saturday), "8" (weekdays),
+        # "9" (weekends), "A" (always) or "B" (never)
+        self.label = b"\x32"
+        self.data = label + start + stop
+
     def display_text_at_xy(self, enabled, x, y, text):
         self.label = b"\x2B"
         status = "\x2B" if enabled else "\x2D"
@@ -92,9 +104,11 @@ class WriteSpecialFunctions:
     def soft_reset(self):
         self.label = b"\x2C"
 
-    def set_run_sequence(self, sequence):
+    def set_run_sequence(self, labels, order="T", locked=False):
+        # Order: "T" follows the run time tables, "S" ignores them, "D" ignores them
+        # and deletes each file once displayed
         self.label = b"\x2E"
-        self.data = sequence
+        self.data = order.encode() + (b"L" if locked else b"U") + labels.encode()
 
     def set_dimming_reg(self, dim, brightness):
         self.label = b"\x2F"
@@ -115,13 +129,14 @@ class WriteSpecialFunctions:
         if not self.label:
             return
 
-        # This one is simple: label (function) and it's data (parameters)
-        if self.label == "\x24" and self.memory_configs:
-            bytes = self.label + self.data
-        else:
+        # This one is simple: label (function) and it's data (parameters),
+        # or the memory configs for a memory configuration
+        if self.label == b"\x24" and self.memory_configs:
             bytes = self.label
             for config in self.memory_configs:
                 bytes += config
+        else:
+            bytes = self.label + self.data
 
         return bytes
 
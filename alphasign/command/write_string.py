@@ -0,0 +1,22 @@
+# Write String command, sends the content of a STRING file
+class WriteString:
+    code = b"G"
+
+    def __init__(self, text, label="1"):
+        self.text = text
+        self.label = label
+
+        # Checksum?
+        self.checksum = False
+
+    def to_bytes(self):
+        # A Write String command is the label followed by the string (no ESC/mode)
+        bytes = self.label.encode()
+
+        # Add the text (special ascii)
+        if isinstance(self.text, str):
+            bytes += self.text.encode()
+        else:
+            bytes += self.text
+
+        return bytes
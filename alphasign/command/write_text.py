@@ -24,10 +24,11 @@ class WriteText:
     def to_bytes(self):
         # A Write command sends a file text,
         # it starts with the label and the ESC byte
-        bytes = self.label.encode() + b"\x1B"
+        bytes = self.label.encode()
 
-        # Add the position and mode
-        bytes += self.position + self.mode
+        # Add the position and mode (none for an empty write, which clears the file)
+        if self.mode is not None:
+            bytes += b"\x1B" + self.position + self.mode
 
         # Add the text (special ascii)
         if isinstance(self.text, str):
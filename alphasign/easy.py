@@ -2,45 +2,85 @@ from .sign import Sign
 from .packet import Packet
 from .command import Command
 from .image import Image
-import time
+from .text import Text
+from .cache import ImageCache
+from .memory import MemoryPlan
+from .state import SignState
+from .alert import Alert
 
 # Easy commands
 class Easy:
 
     class Text:
+        # Priority file, shared by every show() call
+        alert = Alert()
+
         # Easy print text
         @staticmethod
-        def show(text):
-            # Send text immediately on priority label
-            packet = Packet()
-            packet.add_command(Command.write_text(text, label="0"))
-            Sign().send(packet)
+        def show(text, ttl=None):
+            # Send text immediately on priority label, back to the normal files after ttl seconds
+            Easy.Text.alert.show(text, ttl)
+
+        @staticmethod
+        def clear():
+            # Back to the normal files
+            Easy.Text.alert.clear()
 
     class Image:
+        # Converted images, and what the sign holds, shared by every show() call
+        cache = ImageCache()
+        state = SignState()
+
         @staticmethod
-        def show(path, img_label="A", text_label="A"):
-            # Load and convert image
-            img = Image(path)
+        def show(path, img_label="A", text_label="A", dither=None, fit=None):
+            # Load and convert image (or get it from the cache), optionally fitted to the sign (see Image.Fit)
+            img = Image(path, dither=dither, cache=Easy.Image.cache, fit=fit)
+            state = Easy.Image.state
 
-            # Configure memory
-            memconf = Packet()
-            sf = Command.write_special_functions()
-            sf.add_memory_config(img_label, "dots", "locked", (60,7), "8color")
-            sf.add_memory_config(text_label, "text", "locked", 2, {"start": 255, "stop": 255})
-            memconf.add_command(sf)
-            Sign().send(memconf)
+            text = Command.write_text(f"\x14{img_label}", mode=b"b", label=text_label)
 
-            time.sleep(1)
+            # Configure memory, only if these files don't exist yet (this clears all files)
+            state.allocate(MemoryPlan().dots(img_label, img).text(text_label, text))
 
-            # Send image
-            packet = Packet()
-            packet.add_command(Command.write_small_dots(img, label=img_label))
-            Sign().send(packet)
+            # Send image, unless it's already in that label
+            state.upload(Command.write_small_dots(img, label=img_label))
 
-            # Send text to show image
-            packet = Packet()
-            packet.add_command(Command.write_text(f"\x14{img_label}", mode=b"b", label=text_label))
-            Sign().send(packet)
+            # Send text to show image, unless it already does
+            state.upload(text)
+
+        @staticmethod
+        def show_animation(frames, frame_time=1, text_label="A", labels=None, dither=None, fit=None):
+            # Upload every frame once in its own dots file, then let the sign loop them
+            # frame_time is in tenths of a second, frames are paths, PIL images or converted Images
+            images = [frame if isinstance(frame, Image) else Image(frame, dither=dither, cache=Easy.Image.cache, fit=fit)
+                      for frame in frames]
+            state = Easy.Image.state
+
+            # One dots label per frame, skipping the text file's label
+            if labels is None:
+                labels = [label for label in "ABCDEFGHIJKLMNOPQRSTUVWXYZ" if label != text_label]
+            labels = list(labels)
+            if len(images) > len(labels):
+                raise ValueError(f"{len(images)} frames but only {len(labels)} labels available")
+            labels = labels[:len(images)]
+
+            # The animation text calls each picture in turn
+            anim = "".join(Text._anim("dots", label, frame_time) for label in labels)
+            text = Command.write_text(anim, mode=b"b", label=text_label)
+
+            # Configure memory, only if these files don't exist yet (this clears all files)
+            plan = MemoryPlan()
+            for label, img in zip(labels, images):
+                plan.dots(label, img)
+            plan.text(text_label, text)
+            state.allocate(plan)
+
+            # Send the frames that changed
+            for label, img in zip(labels, images):
+                state.upload(Command.write_small_dots(img, label=label))
+
+            # Send the animation text
+            state.upload(text)
 
     class Buzzer:
         @staticmethod
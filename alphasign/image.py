@@ -1,5 +1,11 @@
 from PIL import Image as pimg
-import math
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import hashlib
+import os
+
+from .cache import LRUCache
 
 class Image:
     palette = {
@@ -14,7 +20,68 @@ class Image:
         (255, 255, 0): "8"  # Yellow
     }
 
-    def __init__(self, img, compress=False):
+    # Dithering modes
+    class Dither:
+        none            = None              # Nearest palette color only
+        bayer           = "bayer"           # Ordered dithering (4x4 Bayer matrix)
+        floyd_steinberg = "floyd-steinberg" # Error diffusion to 4 neighbours
+        atkinson        = "atkinson"        # Error diffusion of 3/4 of the error to 6 neighbours
+
+    # 4x4 Bayer threshold matrix, and how far (in RGB units) it may push a pixel
+    bayer_matrix = np.array([
+        [ 0,  8,  2, 10],
+        [12,  4, 14,  6],
+        [ 3, 11,  1,  9],
+        [15,  7, 13,  5],
+    ])
+    bayer_strength = 64
+
+    # Error diffusion kernels: weights for the pixels to the right on the same row,
+    # then (dy, dx, weight) for the rows below, and the common divisor
+    kernels = {
+        "floyd-steinberg": ((7,), ((1, -1, 3), (1, 0, 5), (1, 1, 1)), 16),
+        "atkinson": ((1, 1), ((1, -1, 1), (1, 0, 1), (1, 1, 1), (2, 0, 1)), 8),
+    }
+
+    # Fitting modes (to the sign's geometry, or a given size)
+    class Fit:
+        none      = None        # Keep the image size
+        stretch   = "stretch"   # Resize to the exact size, ignoring the aspect ratio
+        contain   = "contain"   # Scale to fit inside the size (the image may be smaller)
+        crop      = "crop"      # Scale to cover the size, then crop the center
+        letterbox = "letterbox" # Scale to fit inside the size, then pad with black
+
+    # Palette lookup tables used by error diffusion, per palette (5 bits per channel)
+    _luts = {}
+
+    # Resampled images, per source and geometry
+    resized_cache = LRUCache(64)
+
+    def __init__(self, img, compress=False, dither=None, cache=None, fit=None, size=None, resample=pimg.BOX):
+        self.dither = dither
+        self.compress = compress
+
+        # Target size when fitting, defaults to the sign's geometry
+        if fit:
+            size = tuple(size) if size else self.sign_size()
+
+        # Already converted image file, skip decoding and conversion entirely
+        key = self.cache_key(cache, img, fit, size, resample)
+        cached = cache.get(key) if key else None
+        if cached:
+            self.orig = None
+            self.width, self.height, self.conv = cached
+            return
+
+        if fit: # Resample to the target geometry (once per source and geometry)
+            img = self.resized(img, size, fit, resample)
+
+        if isinstance(img, np.ndarray): # Parameter is a pixel array, quantize it directly
+            self.orig = None
+            converted = self.from_array(img, dither, compress)
+            self.width, self.height, self.conv = converted.width, converted.height, converted.conv
+            return
+
         if isinstance(img, str): # Parameter is path to image, open it in PIL
             self.orig = pimg.open(img).convert('RGB')
         else: # Parameter is PIL image, use it directly
@@ -22,27 +89,310 @@ class Image:
         self.width = self.orig.width
         self.height = self.orig.height
         self.conv = self.img_convert(self.orig)
-        self.compress = compress
+
+        if key:
+            cache.put(key, self.width, self.height, self.conv)
+
+    def cache_key(self, cache, img, fit=None, size=None, resample=None):
+        # Only image files can be cached, PIL images have no stable identity
+        if cache is None or not isinstance(img, str):
+            return None
+        params = {"palette": tuple(self.palette.items()), "dither": self.dither}
+        if fit:
+            params.update(fit=fit, size=size, resample=int(resample))
+        return cache.key(img, **params)
+
+    @staticmethod
+    def sign_size():
+        # Geometry of the active sign type
+        from .sign import Sign
+        sign = Sign()
+        return (sign.width, sign.height)
+
+    @staticmethod
+    def source_id(img):
+        # Identity of a source image: the file's stat signature, or a hash of the pixels
+        if isinstance(img, str):
+            stat = os.stat(img)
+            return ("file", os.path.abspath(img), stat.st_mtime_ns, stat.st_size)
+        if isinstance(img, np.ndarray):
+            data, shape = np.ascontiguousarray(img).data, img.shape
+        else:
+            data, shape = img.tobytes(), (img.mode,) + img.size
+        return ("pixels", hashlib.blake2b(data, digest_size=16).digest(), shape)
+
+    @classmethod
+    def resized(cls, img, size, fit=Fit.crop, resample=pimg.BOX):
+        # Resampled copy of img (path, PIL image or array), cached per source and geometry
+        key = (cls.source_id(img), tuple(size), fit, int(resample))
+        result = cls.resized_cache.get(key)
+        if result is None:
+            if isinstance(img, str):
+                img = pimg.open(img)
+            elif isinstance(img, np.ndarray):
+                img = pimg.fromarray(img)
+            result = cls.resize(img, size, fit, resample)
+            cls.resized_cache.put(key, result)
+        return result
+
+    @staticmethod
+    def resize(img, size, fit=Fit.crop, resample=pimg.BOX):
+        # Fit a PIL image to size, see Image.Fit
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        width, height = size
+        if fit is None or img.size == (width, height):
+            return img
+        if fit == Image.Fit.stretch:
+            return img.resize((width, height), resample)
+
+        # Scale to cover (crop) or to fit inside (contain, letterbox)
+        if fit == Image.Fit.crop:
+            scale = max(width / img.width, height / img.height)
+        elif fit in (Image.Fit.contain, Image.Fit.letterbox):
+            scale = min(width / img.width, height / img.height)
+        else:
+            raise ValueError(f"Unknown fit mode: {fit}")
+        scaled = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+        if fit == Image.Fit.crop:
+            scaled = (max(width, scaled[0]), max(height, scaled[1]))
+        else:
+            scaled = (min(width, scaled[0]), min(height, scaled[1]))
+        img = img.resize(scaled, resample)
+
+        left, top = (scaled[0] - width) // 2, (scaled[1] - height) // 2
+        if fit == Image.Fit.crop:
+            return img.crop((left, top, left + width, top + height))
+        if fit == Image.Fit.letterbox:
+            canvas = pimg.new("RGB", (width, height))
+            canvas.paste(img, (-left, -top))
+            return canvas
+        return img
 
     def img_convert(self, img):
-        # Final converted image
-        conv = b""
+        # Get the RGB values as a HxWx3 array
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        pixels = np.asarray(img)
+
+        # Map to palette indexes, then to the ASCII color codes
+        return self.encode(self.quantize(pixels, self.dither))
+
+    def palette_arrays(self):
+        # Palette colors (Nx3) and their ASCII codes (N), in palette order
+        colors = np.array(list(self.palette.keys()), dtype=np.int32)
+        codes = np.frombuffer("".join(self.palette.values()).encode(), dtype=np.uint8)
+        return colors, codes
 
-        # Convert the image to palette
-        for y in range(img.height):
-            line = []
-            for x in range(img.width):
-                # Get the original RGB values
-                r,g,b = img.getpixel((x,y))
+    def nearest(self, pixels):
+        # Round to closest palette color (using Euclidean distance), ties go to the first color
+        colors, _ = self.palette_arrays()
+        diff = pixels[..., np.newaxis, :].astype(np.int32) - colors
+        return np.einsum("...ij,...ij->...i", diff, diff).argmin(axis=-1)
 
-                # Round to closest palette color (using Euclidean distance)
-                distances = {index: math.sqrt((r - pr) ** 2 + (g - pg) ** 2 + (b - pb) ** 2) for (pr, pg, pb), index in self.palette.items()}
-                index = min(distances, key=distances.get)
+    def quantize(self, pixels, dither=None):
+        if dither is None:
+            return self.nearest(pixels)
+        elif dither == Image.Dither.bayer:
+            return self.nearest(self.bayer(pixels))
+        elif dither in self.kernels:
+            return self.diffuse(pixels, self.kernels[dither])
+        raise ValueError(f"Unknown dither mode: {dither}")
 
-                conv += index.encode()
-            conv += b"\x0D"
+    def bayer(self, pixels):
+        # Offset each pixel by its threshold in the tiled matrix
+        h, w = pixels.shape[:2]
+        matrix = (self.bayer_matrix + 0.5) / self.bayer_matrix.size - 0.5
+        thresholds = np.tile(matrix, (h // 4 + 1, w // 4 + 1))[:h, :w]
+        offset = (thresholds * self.bayer_strength)[..., np.newaxis]
+        return np.clip(pixels + offset, 0, 255).round().astype(np.int32)
 
-        return conv
+    def lut(self):
+        # 32x32x32 nearest color table, built once per palette
+        key = tuple(self.palette.items())
+        if key not in Image._luts:
+            levels = np.arange(32) * 8 + 4
+            grid = np.stack(np.meshgrid(levels, levels, levels, indexing="ij"), axis=-1)
+            Image._luts[key] = self.nearest(grid).ravel().tolist()
+        return Image._luts[key]
+
+    def diffuse(self, pixels, kernel):
+        right, below, divisor = kernel
+        w1, w2 = (tuple(right) + (0, 0))[:2]
+        h, w = pixels.shape[:2]
+        colors = self.palette_arrays()[0].tolist()
+        lut = self.lut()
+
+        # Working copy, padded so the kernels below never fall off the edges
+        work = np.zeros((h + 2, w + 2, 3), dtype=np.float32)
+        work[:h, 1:w + 1] = pixels
+        out = np.empty((h, w), dtype=np.intp)
+
+        for y in range(h):
+            # Propagate along the row sequentially, carrying the error for the next two pixels
+            indexes = []
+            errors = []
+            r1 = g1 = b1 = r2 = g2 = b2 = 0.0
+            for r, g, b in work[y, 1:w + 1].tolist():
+                r += r1
+                g += g1
+                b += b1
+                ri = 0 if r < 0 else 31 if r >= 255 else int(r) >> 3
+                gi = 0 if g < 0 else 31 if g >= 255 else int(g) >> 3
+                bi = 0 if b < 0 else 31 if b >= 255 else int(b) >> 3
+                index = lut[(ri << 10) | (gi << 5) | bi]
+                pr, pg, pb = colors[index]
+                er, eg, eb = (r - pr) / divisor, (g - pg) / divisor, (b - pb) / divisor
+                r1, g1, b1 = r2 + er * w1, g2 + eg * w1, b2 + eb * w1
+                r2, g2, b2 = er * w2, eg * w2, eb * w2
+                indexes.append(index)
+                errors.append((er, eg, eb))
+            out[y] = indexes
+
+            # Then push the whole row's error to the rows below at once
+            errors = np.array(errors, dtype=np.float32)
+            for dy, dx, weight in below:
+                work[y + dy, 1 + dx:w + 1 + dx] += errors * weight
+
+        return out
+
+    def encode(self, indexes):
+        # One ASCII color code per pixel, with a CR at the end of each line
+        _, codes = self.palette_arrays()
+        lines = np.empty((indexes.shape[0], indexes.shape[1] + 1), dtype=np.uint8)
+        lines[:, :-1] = codes[indexes]
+        lines[:, -1] = 0x0D
+        return lines.tobytes()
 
     def to_bytes(self):
         return self.conv
+
+    @classmethod
+    def encoded(cls, conv, width, height, dither=None, compress=False):
+        # Image from an already converted payload
+        img = cls.__new__(cls)
+        img.orig = None
+        img.dither = dither
+        img.compress = compress
+        img.width, img.height, img.conv = width, height, conv
+        return img
+
+    @classmethod
+    def from_array(cls, pixels, dither=None, compress=False, bgr=False):
+        # Image from a HxWx3 (or HxWx4) uint8 array, quantized in place without PIL
+        # bgr is for OpenCV frames; the array isn't kept once encoded
+        pixels = np.asarray(pixels)
+        if pixels.dtype != np.uint8 or pixels.ndim != 3 or pixels.shape[2] not in (3, 4):
+            raise ValueError(f"Expected a HxWx3 uint8 array, got {pixels.shape} {pixels.dtype}")
+        pixels = pixels[..., 2::-1] if bgr else pixels[..., :3]
+
+        img = cls.encoded(None, pixels.shape[1], pixels.shape[0], dither, compress)
+        img.conv = img.encode(img.quantize(pixels, dither))
+        return img
+
+    @classmethod
+    def from_buffer(cls, buffer, width, height, dither=None, compress=False, channels=3, bgr=False):
+        # Image from raw packed pixels (bytes, memoryview, mmap...), without copying them
+        pixels = np.frombuffer(buffer, dtype=np.uint8, count=width * height * channels)
+        return cls.from_array(pixels.reshape(height, width, channels), dither, compress, bgr)
+
+    @classmethod
+    def batch(cls, frames, dither=None, workers=None, path=None):
+        # Convert a sequence of same-sized frames (HxWx3 arrays or PIL images) in a process pool
+        frames = [np.asarray(f.convert("RGB") if isinstance(f, pimg.Image) else f, dtype=np.uint8) for f in frames]
+        if not frames:
+            raise ValueError("No frames to convert")
+        shape = frames[0].shape
+        if any(f.shape != shape for f in frames) or len(shape) != 3 or shape[2] != 3:
+            raise ValueError("Frames must all be HxWx3 arrays of the same size")
+        count, (height, width) = len(frames), shape[:2]
+        out_shape = (count, height, width + 1)
+
+        # Shared memory blocks, always released (a failed conversion must not leak them in /dev/shm)
+        segments = []
+        try:
+            # Output is either a .npy file (memory-mappable) or a shared memory block
+            if path:
+                np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=out_shape).flush()
+                output = ("file", path)
+            else:
+                out_shm = shared_memory.SharedMemory(create=True, size=int(np.prod(out_shape)))
+                segments.append(out_shm)
+                output = ("shm", out_shm.name)
+
+            # Frames go to the workers through shared memory, never pickled
+            in_shm = shared_memory.SharedMemory(create=True, size=count * frames[0].nbytes)
+            segments.append(in_shm)
+            pixels = np.ndarray((count,) + shape, dtype=np.uint8, buffer=in_shm.buf)
+            for i, frame in enumerate(frames):
+                pixels[i] = frame
+            del frames, pixels
+
+            # Split in a few chunks per worker, to balance the load
+            workers = workers or os.cpu_count() or 1
+            step = max(1, -(-count // (workers * 4)))
+            chunks = [(cls, in_shm.name, (count,) + shape, output, out_shape, start, min(start + step, count), dither)
+                      for start in range(0, count, step)]
+            if workers == 1:
+                for chunk in chunks:
+                    _convert_frames(*chunk)
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    for future in [pool.submit(_convert_frames, *chunk) for chunk in chunks]:
+                        future.result()
+
+            if path:
+                return FrameBatch.load(path)
+            return FrameBatch(np.ndarray(out_shape, dtype=np.uint8, buffer=out_shm.buf).copy())
+        finally:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+
+
+# Worker side of Image.batch: converts frames [start, stop) from shared memory
+def _convert_frames(cls, source, shape, output, out_shape, start, stop, dither):
+    in_shm = shared_memory.SharedMemory(name=source)
+    out_shm = None
+    try:
+        pixels = np.ndarray(shape, dtype=np.uint8, buffer=in_shm.buf)
+        if output[0] == "file":
+            payloads = np.load(output[1], mmap_mode="r+")
+        else:
+            out_shm = shared_memory.SharedMemory(name=output[1])
+            payloads = np.ndarray(out_shape, dtype=np.uint8, buffer=out_shm.buf)
+
+        # Only the palette and conversion methods are needed, not a full Image
+        converter = cls.__new__(cls)
+        for i in range(start, stop):
+            payloads[i] = np.frombuffer(converter.encode(converter.quantize(pixels[i], dither)), dtype=np.uint8).reshape(out_shape[1:])
+
+        if output[0] == "file":
+            payloads.flush()
+        del pixels, payloads
+    finally:
+        in_shm.close()
+        if out_shm:
+            out_shm.close()
+
+
+# Encoded frames (one payload per frame, CR-terminated lines), possibly memory-mapped from a .npy file
+class FrameBatch:
+    def __init__(self, payloads):
+        self.payloads = payloads
+        self.height = payloads.shape[1]
+        self.width = payloads.shape[2] - 1
+
+    @classmethod
+    def load(cls, path):
+        return cls(np.load(path, mmap_mode="r"))
+
+    def __len__(self):
+        return len(self.payloads)
+
+    def __getitem__(self, index):
+        return Image.encoded(self.payloads[index].tobytes(), self.width, self.height)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
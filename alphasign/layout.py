@@ -0,0 +1,103 @@
+import time
+
+from .sign import Sign
+from .text import Text
+from .packet import Packet
+from .command import Command
+from .memory import MemoryPlan, MemoryPlanner
+
+# Text file uploaded once with references to STRING files, whose values are then
+# updated with small Write STRING commands instead of rewriting the whole text
+class Layout:
+    # STRING file labels given to fields in order
+    string_labels = "123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+    # Largest STRING file the protocol allows
+    max_string_size = 125
+
+    def __init__(self, template, label="A", sizes=None, labels=None, mode=Text.Mode.hold,
+                 position=Command.write_text.Position.fill, sign=None, sleep=time.sleep, planner=None):
+        # Template fields (see Text.compile) become STRING references
+        self.template = template if isinstance(template, Text.Template) else Text.compile(template)
+        self.label = label
+        self.mode = mode
+        self.position = position
+        self.sign = sign or Sign()
+        self.planner = planner or MemoryPlanner(self.sign, sleep=sleep)
+
+        # STRING file label of each field, given or picked among the free ones
+        fields = list(dict.fromkeys(self.template.fields))
+        labels = dict(labels or {})
+        free = [l for l in self.string_labels if l != label and l not in labels.values()]
+        for field in fields:
+            if field not in labels:
+                if not free:
+                    raise ValueError(f"No STRING file label left for {field}")
+                labels[field] = free.pop(0)
+        self.labels = {field: labels[field] for field in fields}
+
+        # Size of each STRING file, longer values are truncated
+        sizes = sizes or {}
+        self.sizes = {field: sizes.get(field, 32) for field in fields}
+        for field, size in self.sizes.items():
+            if not 0 < size <= self.max_string_size:
+                raise ValueError(f"STRING file size of {field} must be 1-{self.max_string_size}")
+
+        # Conversion and format spec of each field
+        self.formats = {field: (conversion, spec) for _, field, conversion, spec in self.template.slots}
+
+        # Last value sent to each STRING file
+        self.values = {}
+
+    def text(self):
+        # Template with each field replaced by its STRING reference
+        parts = list(self.template.segments)
+        for index, field, _, _ in self.template.slots:
+            parts[index] = b"\x10" + self.labels[field].encode()
+        return b"".join(parts)
+
+    def command(self):
+        return Command.write_text(self.text(), self.label, self.position, self.mode)
+
+    def encode(self, field, value):
+        if not isinstance(value, bytes):
+            conversion, spec = self.formats[field]
+            value = self.template.format(value, conversion, spec).encode()
+        return value[:self.sizes[field]]
+
+    def memory_plan(self, plan=None):
+        # Text file sized for the layout, and one STRING file per field
+        plan = MemoryPlan() if plan is None else plan
+        plan.text(self.label, self.command())
+        for field, label in self.labels.items():
+            plan.string(label, size=self.sizes[field])
+        return plan
+
+    def setup(self, **values):
+        # Configure memory if needed (this clears all files)
+        self.planner.apply(self.memory_plan())
+        self.values.clear()
+
+        # Upload the layout once, then its values
+        packet = Packet()
+        packet.add_command(self.command())
+        self.sign.send(packet)
+        self.update(**values)
+
+    def update(self, **values):
+        # Send only the values that changed, nested in a single packet
+        changed = {}
+        for field, value in values.items():
+            if field not in self.labels:
+                raise KeyError(field)
+            encoded = self.encode(field, value)
+            if self.values.get(field) != encoded:
+                changed[field] = encoded
+
+        if changed:
+            packet = Packet()
+            for field, encoded in changed.items():
+                packet.add_command(Command.write_string(encoded, self.labels[field]))
+            self.sign.send(packet)
+            self.values.update(changed)
+        return list(changed)
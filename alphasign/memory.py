@@ -0,0 +1,137 @@
+import math
+import time
+
+from .sign import Sign
+from .packet import Packet
+from .command import Command
+
+# Memory layout of the sign's files, each sized from its content
+class MemoryPlan:
+    # Bits per dot of DOTS pictures, for their memory footprint
+    dot_bits = { "monochrome": 1, "3color": 2, "8color": 4 }
+
+    # Largest STRING file the protocol allows
+    max_string_size = 125
+
+    def __init__(self):
+        # (label, type) -> (size, conf), in configuration order. Files of different
+        # types may share a label (eg. a text file calling the picture of the same label)
+        self.files = {}
+
+    @classmethod
+    def from_configs(cls, configs):
+        # Plan of a configuration read from the sign (see ReadSpecialFunctions.parse_memory_config)
+        colors = { "1000": "monochrome", "2000": "3color", "8000": "8color" }
+        plan = cls()
+        for label, type, _, size, conf in configs:
+            if type == "text":
+                plan.files[label, type] = (size, {"start": conf[:2], "stop": conf[2:]})
+            elif type == "string":
+                plan.files[label, type] = (size, None)
+            elif type == "dots":
+                plan.files[label, type] = (size, colors.get(conf, "8color"))
+        return plan
+
+    @staticmethod
+    def encoded_size(content):
+        # Content, or the write command storing it: a TEXT file also holds the command's
+        # ESC, position and mode, so files are sized from the command (label excluded)
+        if hasattr(content, "to_bytes"):
+            return len(content.to_bytes()) - 1
+        return len(content.encode() if isinstance(content, str) else content)
+
+    def text(self, label, content=b"", size=None, slack=0, start="FF", stop="00"):
+        # Exact size of the content or write command (plus room to grow), displayed always by default
+        size = self.encoded_size(content) if size is None else size
+        self.files[label, "text"] = (max(1, size + slack), {"start": start, "stop": stop})
+        return self
+
+    def string(self, label, content=b"", size=None, slack=0):
+        size = max(1, (self.encoded_size(content) if size is None else size) + slack)
+        if size > self.max_string_size:
+            raise ValueError(f"STRING file {label} is {size} bytes, at most {self.max_string_size} are allowed")
+        self.files[label, "string"] = (size, None)
+        return self
+
+    def dots(self, label, image=None, size=None, colors="8color"):
+        # Size (width, height) of the picture
+        size = (image.width, image.height) if size is None else tuple(size)
+        self.files[label, "dots"] = (size, colors)
+        return self
+
+    def footprint(self, label, type):
+        # Bytes of sign memory used by a file
+        size, conf = self.files[label, type]
+        if type == "dots":
+            return math.ceil(size[0] * size[1] * self.dot_bits.get(conf, 4) / 8)
+        return size
+
+    def total(self):
+        return sum(self.footprint(label, type) for label, type in self.files)
+
+    def command(self):
+        # One memory configuration command for every file
+        sf = Command.write_special_functions()
+        for (label, type), (size, conf) in self.files.items():
+            sf.add_memory_config(label, type, "locked", size, conf)
+        return sf
+
+    def configs(self):
+        return self.command().memory_configs
+
+    def __eq__(self, other):
+        return isinstance(other, MemoryPlan) and self.configs() == other.configs()
+
+
+# Applies memory plans to a sign, only when they change (a configuration clears every file)
+class MemoryPlanner:
+    def __init__(self, sign=None, capacity=None, sleep=time.sleep):
+        # Sign, or the shared Sign() when None (resolved on use)
+        self._sign = sign
+
+        # Memory available for files, in bytes (see read_capacity)
+        self.capacity = capacity
+        self.sleep = sleep
+
+        # Configuration currently on the sign
+        self.configs = None
+
+    @property
+    def sign(self):
+        return self._sign or Sign()
+
+    def read_capacity(self, timeout=3):
+        # Ask the sign for its memory size
+        packet = Packet()
+        command = Command.read_special_functions()
+        command.read_memory_size()
+        packet.add_command(command)
+        response = self.sign.request(packet, timeout)
+        if response is None or not response.commands:
+            raise TimeoutError("No memory size response from the sign")
+        self.capacity = Command.read_special_functions.parse_memory_size(response.commands[0].to_bytes())
+        return self.capacity
+
+    def check(self, plan):
+        if self.capacity is not None and plan.total() > self.capacity:
+            raise ValueError(f"Memory plan needs {plan.total()} bytes but the sign has {self.capacity}")
+
+    def changed(self, plan):
+        return plan.configs() != self.configs
+
+    def apply(self, plan):
+        # Returns whether the sign was reconfigured (and its files cleared)
+        if not self.changed(plan):
+            return False
+        self.check(plan)
+
+        packet = Packet()
+        packet.add_command(plan.command())
+        self.sign.send(packet)
+        self.configs = plan.configs()
+        self.sleep(1)
+        return True
+
+    def forget(self):
+        # Unknown configuration (eg. after a reset), the next plan is always applied
+        self.configs = None
@@ -0,0 +1,193 @@
+from .sign import Sign
+from .text import Text
+
+# Approximate width of texts on the sign from per-font glyph width tables, to choose
+# between holding and rotating a message and to predict how long it is displayed
+class FontMetrics:
+    # Typical glyph width (columns) of each font, by font code (see Text._font)
+    widths = {
+        b"1": 4, # 5h-std / 5-slim
+        b"2": 5, # 5-stroke
+        b"3": 5, # 7h-std / 7-slim
+        b"4": 6, # 7-stroke
+        b"5": 6, # 7h-fancy / 7-slimfancy
+        b"6": 6, # 10h-std / 7-strokefancy
+        b"7": 6, # 7-shadow
+        b"8": 9, # fh-fancy / ws7-fancy
+        b"9": 8, # fh-std / ws7
+        b":": 7, # 7-shadowfancy
+        b";": 6, # 5-wide
+        b"<": 8, # 7-wide
+        b"=": 9, # 7-fancywide
+        b">": 6, # ws5
+        b"W": 5, # 5h-custom
+        b"X": 5, # 7h-custom
+        b"Y": 6, # 10h-custom
+        b"Z": 9, # 15h-custom
+    }
+
+    # Narrow glyphs with proportional spacing, by width in a 5 columns font (scaled to each font)
+    narrow = {
+        1: b"!'.:;|i",
+        2: b",`l",
+        3: b" \"()[]{}1Ijt",
+        4: b"<>fkr",
+    }
+
+    # Columns per second of rotate at each speed (1 slowest, 5 fastest and default)
+    rates = {1: 10, 2: 15, 3: 20, 4: 25, 5: 30}
+
+    # Text the sign shows in place of fields, by control code (and format), to measure them
+    placeholders = {
+        b"\x13": b"00:00",
+        b"\x0B0": b"00/00/00", b"\x0B1": b"00/00/00",
+        b"\x0B2": b"00-00-00", b"\x0B3": b"00-00-00",
+        b"\x0B4": b"00.00.00", b"\x0B5": b"00.00.00",
+        b"\x0B6": b"00 00 00", b"\x0B7": b"00 00 00",
+        b"\x0B8": b"MMM.00.0000", b"\x0B9": b"WEDNESDAY",
+        b"\x08\x1C": b"00C", b"\x08\x1D": b"00F",
+        b"\x08\x7A": b"0000", b"\x08\x7B": b"0000", b"\x08\x7C": b"0000",
+        b"\x08\x7D": b"0000", b"\x08\x7E": b"0000",
+    }
+
+    # Bytes taken by control codes the width doesn't depend on
+    skips = { 0x05: 2, 0x06: 2, 0x07: 2, 0x09: 1, 0x1C: 2, 0x1F: 14 }
+
+    # Glyph widths (256 entries) by font code and fixed spacing, built on first use
+    tables = {}
+
+    def __init__(self, width=None, font="7h-std", spacing=1, hold=4):
+        # Sign width in columns, or the width of the shared Sign() when None (resolved on use)
+        self._width = width
+
+        # Font at the start of texts, blank columns between glyphs, and seconds a page is held
+        self.font = Text._font(font)[1:].encode()
+        self.spacing = spacing
+        self.hold = hold
+
+        # Contents of STRING files and widths of DOTS pictures referenced by texts, by label
+        self.strings = {}
+        self.pictures = {}
+
+    @property
+    def sign_width(self):
+        return self._width or Sign().width
+
+    @classmethod
+    def table(cls, font, fixed=False):
+        key = (font, fixed)
+        table = cls.tables.get(key)
+        if table is None:
+            width = cls.widths.get(font, 5)
+            table = [width] * 256
+            if not fixed:
+                for narrow, glyphs in cls.narrow.items():
+                    for glyph in glyphs:
+                        table[glyph] = max(1, round(narrow * width / 5))
+            table = cls.tables[key] = tuple(table)
+        return table
+
+    def pages(self, text, mode=Text.Mode.rotate):
+        # (mode, speed, width) of each page of text (string with control codes, bytes or Text),
+        # pages start at new page codes and mode headers (as in a Write TEXT command)
+        if isinstance(text, Text):
+            text = text.to_bytes()
+        data = text.encode() if isinstance(text, str) else text
+
+        font, fixed, wide, speed = self.font, False, 1, 5
+        table = self.table(font, fixed)
+        pages = []
+        line = width = 0
+        shown = False
+        i, end = 0, len(data)
+        while i < end:
+            byte = data[i]
+            if byte >= 0x20:
+                line += (table[byte] + self.spacing) * wide
+                shown = True
+                i += 1
+                continue
+
+            glyphs = None
+            if byte in (0x0C, 0x0D, 0x1B):
+                # New page or line
+                width = max(width, line - self.spacing if line else 0)
+                line = 0
+                if byte != 0x0D:
+                    if shown:
+                        pages.append((mode, speed, width))
+                    width = 0
+                    shown = False
+                if byte == 0x1B:
+                    # Position and mode
+                    mode = data[i + 2:i + 4] if data[i + 2:i + 3] == b"n" else data[i + 2:i + 3]
+                    i += 1 + len(mode)
+                i += 1
+            elif byte == 0x1A:
+                font = data[i + 1:i + 2]
+                table = self.table(font, fixed)
+                i += 2
+            elif byte == 0x1E:
+                fixed = data[i + 1:i + 2] == b"1"
+                table = self.table(font, fixed)
+                i += 2
+            elif byte in (0x11, 0x12):
+                wide = 2 if byte == 0x11 else 1
+                i += 1
+            elif byte == 0x1D:
+                # Wide and double wide attributes
+                if data[i + 1:i + 2] in (b"0", b"1"):
+                    wide = 2 if data[i + 2:i + 3] == b"1" else 1
+                i += 3
+            elif 0x15 <= byte <= 0x19:
+                speed = byte - 0x14
+                i += 1
+            elif byte == 0x10:
+                glyphs = self.strings.get(data[i + 1:i + 2].decode(errors="replace"), b"")
+                glyphs = glyphs.encode() if isinstance(glyphs, str) else glyphs
+                i += 2
+            elif byte == 0x14:
+                picture = self.pictures.get(data[i + 1:i + 2].decode(errors="replace"), 0)
+                if picture:
+                    line += picture + self.spacing
+                    shown = True
+                i += 2
+            elif byte in (0x08, 0x0B, 0x13):
+                size = 1 if byte == 0x13 else 2
+                # Extended characters are one glyph
+                glyphs = self.placeholders.get(data[i:i + size], b"0")
+                i += size
+            else:
+                i += self.skips.get(byte, 1)
+
+            if glyphs:
+                line += sum(table[glyph] + self.spacing for glyph in glyphs) * wide
+                shown = True
+
+        width = max(width, line - self.spacing if line else 0)
+        if shown or not pages:
+            pages.append((mode, speed, width))
+        return pages
+
+    def width(self, text):
+        # Columns of the widest line
+        return max(width for _, _, width in self.pages(text))
+
+    def fits(self, text):
+        return self.width(text) <= self.sign_width
+
+    def mode(self, text):
+        # Hold messages that fit the sign, rotate the others
+        return Text.Mode.hold if self.fits(text) else Text.Mode.rotate
+
+    def duration(self, text, mode=Text.Mode.rotate):
+        # Seconds to display text once: rotating pages travel across the whole sign, others are held
+        seconds = 0
+        for mode, speed, width in self.pages(text, mode):
+            if mode == Text.Mode.rotate:
+                seconds += (self.sign_width + width) / self.rates[speed]
+            elif mode == Text.Mode.compressed_rotate:
+                seconds += (self.sign_width + width / 2) / self.rates[speed]
+            else:
+                seconds += self.hold
+        return seconds
@@ -1,3 +1,14 @@
+# Command read back from a packet (eg. a sign's response): its code and raw data
+class RawCommand:
+    def __init__(self, code, data, checksum=False):
+        self.code = code
+        self.data = data
+        self.checksum = checksum
+
+    def to_bytes(self):
+        return self.data
+
+
 # Implements the "Standard Transmission Packet" aka "1-byte"/"^A"
 # This doesn't implement the multiple type code and address (no use for it)
 class Packet:
@@ -48,3 +59,22 @@ class Packet:
         bytes += b"\x04"
 
         return bytes
+
+    @staticmethod
+    def parse(data):
+        # Packet from received bytes: sync, SOH, type, address, then commands until EOT
+        start = data.find(b"\x01")
+        end = data.rfind(b"\x04")
+        if start < 0 or end < start + 4:
+            raise ValueError(f"Incomplete packet: {data!r}")
+        packet = Packet(data[start + 1:start + 2].decode(), data[start + 2:start + 4].decode())
+
+        # STX + command code + data, then ETX + checksum when nested or checked
+        for part in data[start + 4:end].split(b"\x02")[1:]:
+            part = part.lstrip(b"\xFF")
+            checksum = False
+            if b"\x03" in part:
+                part, trailer = part.split(b"\x03", 1)
+                checksum = bool(trailer)
+            packet.add_command(RawCommand(part[:1], part[1:], checksum))
+        return packet
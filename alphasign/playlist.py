@@ -0,0 +1,95 @@
+import time
+
+from .text import Text
+from .packet import Packet
+from .command import Command
+from .memory import MemoryPlan
+from .state import SignState
+from .metrics import FontMetrics
+
+# Messages kept resident in their own text files, the ones shown are switched with a
+# run sequence (a few bytes) instead of rewriting a text file
+class Playlist:
+    # Text file labels given to messages in order ("0" is the priority file)
+    text_labels = "ABCDEFGHIJKLMNOPQRSTUVWXYZ123456789"
+
+    def __init__(self, sign=None, state=None, order="T", slack=0, sleep=time.sleep, metrics=None):
+        # Mirror of the sign, shared with other users of the same files
+        self.state = state or SignState(sign, sleep=sleep)
+
+        # Message widths, for modes chosen automatically and display times
+        self.metrics = metrics or FontMetrics()
+
+        # Run sequence order (see WriteSpecialFunctions.set_run_sequence), and extra
+        # room in each text file so updated messages of similar length fit without reconfiguring
+        self.order = order
+        self.slack = slack
+
+        # Name -> (label, write command), in insertion order
+        self.messages = {}
+
+        # Labels currently in the run sequence
+        self.sequence = None
+
+    def add(self, name, text, mode=Text.Mode.rotate, position=Command.write_text.Position.fill, label=None):
+        # Add or replace a message, text is a string with control codes, bytes or a Text,
+        # mode None holds it if it fits the sign and rotates it otherwise
+        if isinstance(text, Text):
+            text = text.to_bytes()
+        if mode is None:
+            mode = self.metrics.mode(text)
+        if label is None:
+            if name in self.messages:
+                label = self.messages[name][0]
+            else:
+                used = {label for label, _ in self.messages.values()}
+                free = [l for l in self.text_labels if l not in used]
+                if not free:
+                    raise ValueError(f"No text file label left for {name}")
+                label = free[0]
+        self.messages[name] = (label, Command.write_text(text, label, position, mode))
+        return label
+
+    def remove(self, name):
+        self.messages.pop(name)
+
+    def memory_plan(self, plan=None):
+        # One text file per message, sized for it
+        plan = MemoryPlan() if plan is None else plan
+        for label, command in self.messages.values():
+            plan.text(label, command, slack=self.slack)
+        return plan
+
+    def upload(self):
+        # Send the messages the sign doesn't hold yet, returns their names
+        if self.state.allocate(self.memory_plan()):
+            self.reset()
+        return [name for name, (_, command) in self.messages.items() if self.state.upload(command)]
+
+    def duration(self, *names):
+        # Estimated seconds for the sign to go through these messages (all of them by default)
+        names = names or list(self.messages)
+        return sum(self.metrics.duration(self.messages[name][1].to_bytes()[1:]) for name in names)
+
+    def reset(self):
+        # Memory was reconfigured, the sign forgot the run sequence
+        self.sequence = None
+
+    def show(self, *names):
+        # Display these messages in turn (all of them by default), uploading only missing ones
+        names = names or list(self.messages)
+        for name in names:
+            if name not in self.messages:
+                raise KeyError(name)
+        self.upload()
+
+        labels = "".join(self.messages[name][0] for name in names)
+        if labels == self.sequence:
+            return False
+        packet = Packet()
+        command = Command.write_special_functions()
+        command.set_run_sequence(labels, self.order)
+        packet.add_command(command)
+        self.state.sign.send(packet)
+        self.sequence = labels
+        return True
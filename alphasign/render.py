@@ -0,0 +1,105 @@
+import threading
+
+import numpy as np
+from PIL import Image as pimg
+from PIL import ImageDraw, ImageFont
+
+from .image import Image
+
+# Renders text with a TrueType font into dots pictures, glyph by glyph
+class TextRenderer:
+    # Color names (same as Text.ctrl) to palette codes
+    colors = {
+        "black": "0",
+        "red": "1",
+        "green": "2",
+        "amber": "3",
+        "dimred": "4",
+        "dimgreen": "5",
+        "brown": "6",
+        "orange": "7",
+        "yellow": "8",
+    }
+
+    # Glyph atlases, shared by renderers with the same font, height, colors and rasterization
+    _atlases = {}
+    _lock = threading.Lock()
+
+    def __init__(self, font=None, height=None, color="amber", background="black", spacing=1, threshold=128,
+                 antialias=False):
+        # TrueType font path (PIL's default font if None), rendered at the sign's height by default
+        self.font_path = font
+        self.height = height or Image.sign_size()[1]
+
+        # Palette codes of the text and background, as bytes
+        self.color = self.palette_code(color)
+        self.background = self.palette_code(background)
+
+        # Blank columns between glyphs, and coverage (0-255) above which a dot is lit
+        # (only meaningful with antialiasing, which mostly blurs small sizes)
+        self.spacing = spacing
+        self.threshold = threshold
+        self.antialias = antialias
+
+        self.font, self.baseline = self.load_font()
+
+        key = (font, self.height, self.color, self.background, threshold, antialias)
+        with TextRenderer._lock:
+            self.atlas = TextRenderer._atlases.setdefault(key, {})
+
+    @classmethod
+    def palette_code(cls, color):
+        # Color name, palette code or RGB tuple
+        if isinstance(color, tuple):
+            return Image.palette[min(Image.palette, key=lambda c: sum((a - b) ** 2 for a, b in zip(c, color)))].encode()
+        if color in cls.colors:
+            return cls.colors[color].encode()
+        if color in Image.palette.values():
+            return color.encode()
+        raise ValueError(f"Unknown color: {color}")
+
+    def load_font(self):
+        # Largest font size whose ascent + descent fits in the height
+        for size in range(self.height, 0, -1):
+            if self.font_path:
+                font = ImageFont.truetype(self.font_path, size)
+            else:
+                try:
+                    font = ImageFont.load_default(size)
+                except TypeError:
+                    raise ValueError("Pillow < 10.1 has no scalable default font, pass a TrueType font path")
+            ascent, descent = font.getmetrics()
+            if ascent + descent <= self.height or size == 1:
+                # Center the line vertically, baseline is where glyphs sit
+                return font, (self.height - ascent - descent) // 2 + ascent
+
+    def glyph(self, char):
+        # Palette codes (HxW uint8) of one character, rasterized once per atlas
+        glyph = self.atlas.get(char)
+        if glyph is None:
+            width = max(1, round(self.font.getlength(char)))
+            mask = pimg.new("L", (width, self.height))
+            draw = ImageDraw.Draw(mask)
+            if not self.antialias:
+                draw.fontmode = "1"
+            draw.text((0, self.baseline), char, font=self.font, fill=255, anchor="ls")
+            lit = np.asarray(mask) >= self.threshold
+            glyph = np.where(lit, self.color[0], self.background[0]).astype(np.uint8)
+            self.atlas[char] = glyph
+        return glyph
+
+    def width(self, text):
+        # Width in dots of rendered text
+        return sum(self.glyph(char).shape[1] for char in text) + self.spacing * max(0, len(text) - 1)
+
+    def render(self, text):
+        # Blit the glyphs side by side, then end each line with a CR (empty text is
+        # one blank column, pictures can't be 0 dots wide)
+        lines = np.full((self.height, max(1, self.width(text)) + 1), self.background[0], dtype=np.uint8)
+        x = 0
+        for char in text:
+            glyph = self.glyph(char)
+            lines[:, x:x + glyph.shape[1]] = glyph
+            x += glyph.shape[1] + self.spacing
+        lines[:, -1] = 0x0D
+        return Image.encoded(lines.tobytes(), lines.shape[1] - 1, self.height)
@@ -0,0 +1,104 @@
+import datetime
+import time
+
+from .text import Text
+from .packet import Packet
+from .command import Command
+from .playlist import Playlist
+
+# Playlist whose messages run on the sign's own clock: each message gets run time and
+# run day tables, uploaded once, then the sign switches content by itself
+class Schedule(Playlist):
+    # Run day table codes
+    days = {
+        "daily": "0",
+        "sunday": "1",
+        "monday": "2",
+        "tuesday": "3",
+        "wednesday": "4",
+        "thursday": "5",
+        "friday": "6",
+        "saturday": "7",
+        "weekdays": "8",
+        "weekends": "9",
+        "always": "A",
+        "never": "B",
+    }
+
+    def __init__(self, sign=None, state=None, slack=0, sleep=time.sleep, metrics=None):
+        # Run sequences follow the run time tables
+        super().__init__(sign, state, order="T", slack=slack, sleep=sleep, metrics=metrics)
+
+        # Name -> (start, stop, start day, stop day) codes
+        self.times = {}
+
+        # Label -> tables the sign holds
+        self.tables = {}
+
+    # Run time table code of a window lasting the whole (run) day
+    all_day = "FD"
+
+    @staticmethod
+    def time_code(value):
+        # "HH:MM" or datetime.time, rounded down to the sign's 10 minutes steps. "24:00" ends
+        # a window at midnight, where the sign's day starts over ("00", as "00:00")
+        if isinstance(value, str):
+            hours, minutes = map(int, value.split(":"))
+            value = datetime.time(0, 0) if (hours, minutes) == (24, 0) else datetime.time(hours, minutes)
+        return f"{(value.hour * 60 + value.minute) // 10:02X}"
+
+    @classmethod
+    def day_codes(cls, days):
+        # Day name / group, or a (first, last) range of day names
+        first, last = (days, days) if isinstance(days, str) else days
+        if first not in cls.days or last not in cls.days:
+            raise ValueError(f"Unknown days: {days}")
+        return cls.days[first], cls.days[last]
+
+    def add(self, name, text, start=None, stop=None, days="daily", mode=Text.Mode.rotate,
+            position=Command.write_text.Position.fill, label=None):
+        # Shown from start to stop (always if None) on the given days
+        if (start is None) != (stop is None):
+            raise ValueError("start and stop go together")
+        times = ("FF", "00") if start is None else (self.time_code(start), self.time_code(stop))
+        if times == ("00", "00"):
+            # Midnight to midnight
+            times = (self.all_day, "00")
+        times += self.day_codes(days)
+        label = super().add(name, text, mode, position, label)
+        self.times[name] = times
+        return label
+
+    def remove(self, name):
+        super().remove(name)
+        self.times.pop(name)
+
+    def reset(self):
+        # Memory was reconfigured, run tables are back to the configuration's
+        super().reset()
+        self.tables.clear()
+
+    def install(self):
+        # Upload missing messages and changed run tables (nested in one packet), then run
+        # every message. Returns the labels whose tables were sent
+        self.upload()
+
+        packet = Packet()
+        labels = []
+        for name, (label, _) in self.messages.items():
+            start, stop, first, last = self.times[name]
+            if self.tables.get(label) == self.times[name]:
+                continue
+            run_time = Command.write_special_functions()
+            run_time.set_run_time_table(label.encode(), start.encode(), stop.encode())
+            run_day = Command.write_special_functions()
+            run_day.set_run_day_table(label.encode(), first.encode(), last.encode())
+            packet.add_command(run_time)
+            packet.add_command(run_day)
+            self.tables[label] = self.times[name]
+            labels.append(label)
+        if labels:
+            self.state.sign.send(packet)
+
+        self.show()
+        return labels
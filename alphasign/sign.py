@@ -1,6 +1,7 @@
 import time
 import socket
 import re
+import threading
 
 # Try to import pyserial, but don't fail if it's not available
 try:
@@ -29,6 +30,10 @@ class Sign(metaclass=Singleton):
         self._ip_conn = None
         self._connection_type = None
 
+        # Serializes packets from every thread (eg. alert TTL timers), so their
+        # pauses never let another packet's bytes in
+        self.lock = threading.RLock()
+
     @classmethod
     def get_available_connections(cls):
         """Get list of available connection types"""
@@ -121,9 +126,10 @@ class Sign(metaclass=Singleton):
         bytes = data.to_bytes() if isinstance(data, Packet) else data
 
         parts = bytes.split(b"\xFF")
-        for part in parts:
-            self.write(part)
-            time.sleep(0.1)
+        with self.lock:
+            for part in parts:
+                self.write(part)
+                time.sleep(0.1)
 
 
     # TODO: be able to parse and send Packet back
@@ -135,6 +141,29 @@ class Sign(metaclass=Singleton):
             if raw:
                 return self._ip_conn.read()
 
+    # Wait for a whole packet (up to EOT) from the sign, None on timeout
+    def receive(self, timeout=3, clock=time.monotonic):
+        data = b""
+        end = clock() + timeout
+        while clock() < end:
+            byte = self.read()
+            if byte is None:
+                # No connection
+                return None
+            if not byte:
+                continue
+            data += byte
+            if byte == b"\x04":
+                return Packet.parse(data)
+        return None
+
+    # Send a read command and return the sign's response packet
+    def request(self, data, timeout=3):
+        # The response is read before any other packet is sent
+        with self.lock:
+            self.send(data)
+            return self.receive(timeout)
+
     def close(self):
         if self._connection_type == 'serial' and self._ser:
             self._ser.close()
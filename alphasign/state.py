@@ -0,0 +1,102 @@
+import hashlib
+import time
+
+from .packet import Packet
+from .command import Command
+from .memory import MemoryPlan, MemoryPlanner
+
+# Host-side mirror of the sign: its memory layout and a digest of each file's content,
+# so content already on the sign is never uploaded again
+class SignState:
+    # File type written by each command (and answered to read requests)
+    types = { b"A": "text", b"G": "string", b"I": "dots" }
+
+    def __init__(self, sign=None, capacity=None, sleep=time.sleep):
+        self.planner = MemoryPlanner(sign, capacity, sleep)
+
+        # Memory layout on the sign, and (label, type) -> digest of the content it holds
+        self.plan = MemoryPlan()
+        self.contents = {}
+
+    @property
+    def sign(self):
+        return self.planner.sign
+
+    @staticmethod
+    def stored(command):
+        # File ((label, type)) and content a write command leaves in memory, the same for
+        # the commands the sign answers read requests with (pauses aren't stored)
+        data = command.to_bytes().replace(b"\xFF", b"")
+        return (data[:1].decode(), SignState.types.get(command.code)), data[1:]
+
+    @staticmethod
+    def digest(content):
+        return hashlib.blake2b(content, digest_size=8).digest()
+
+    def allocate(self, plan):
+        # Add the plan's files to the layout, memory is only reconfigured (clearing every
+        # file) when a file is missing or differs. Returns whether it was reconfigured
+        merged = MemoryPlan()
+        merged.files = {**self.plan.files, **plan.files}
+        if not self.planner.changed(merged):
+            return False
+        self.planner.apply(merged)
+        self.plan = merged
+        self.contents.clear()
+        return True
+
+    def resident(self, command):
+        file, content = self.stored(command)
+        return self.contents.get(file) == self.digest(content)
+
+    def upload(self, command):
+        # Send a write command, unless the sign already holds its content
+        if self.resident(command):
+            return False
+        packet = Packet()
+        packet.add_command(command)
+        self.sign.send(packet)
+        file, content = self.stored(command)
+        self.contents[file] = self.digest(content)
+        return True
+
+    def resync(self, timeout=3):
+        # Rebuild the mirror from the sign itself (eg. after a restart): memory size,
+        # memory configuration, then the content of every file
+        self.planner.read_capacity(timeout)
+
+        command = Command.read_special_functions()
+        command.read_memory_config()
+        response = self.request(command, timeout)
+        if response is None:
+            raise TimeoutError("No memory configuration response from the sign")
+        self.plan = MemoryPlan.from_configs(Command.read_special_functions.parse_memory_config(response.to_bytes()))
+        self.planner.configs = self.plan.configs()
+
+        # Files that can't be read stay unknown, and will be uploaded
+        self.contents.clear()
+        for label, type in self.plan.files:
+            response = self.request(Command.read_file(label, type), timeout)
+            if response is not None:
+                file, content = self.stored(response)
+                if file == (label, type):
+                    self.contents[file] = self.digest(content)
+        return self.plan
+
+    def request(self, command, timeout):
+        # First command of the sign's response, None on timeout
+        packet = Packet()
+        packet.add_command(command)
+        response = self.sign.request(packet, timeout)
+        return response.commands[0] if response is not None and response.commands else None
+
+    def forget(self, label=None, type=None):
+        # Unknown content for one label (of every type by default), or unknown layout
+        # and contents (eg. after a reset)
+        if label is not None:
+            for file in [file for file in self.contents if file[0] == label and type in (None, file[1])]:
+                del self.contents[file]
+            return
+        self.plan = MemoryPlan()
+        self.contents.clear()
+        self.planner.forget()
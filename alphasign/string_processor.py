@@ -3,6 +3,167 @@ Alpha Sign String Processing Module
 Based on the C++ implementation, converts human-readable strings to Alpha sign commands.
 """
 
+import re
+import unicodedata
+
+from .cache import LRUCache
+
+# Tags converted by make_alpha, and their control codes
+TAGS = {
+    # Speed controls
+    "<SPEED:1>": chr(21),
+    "</SPEED:1>": chr(9),  # Reset to no speed
+    "<SPEED:2>": chr(22),
+    "</SPEED:2>": chr(9),  # Reset to no speed
+    "<SPEED:3>": chr(23),
+    "</SPEED:3>": chr(9),  # Reset to no speed
+    "<SPEED:4>": chr(24),
+    "</SPEED:4>": chr(9),  # Reset to no speed
+    "<SPEED:5>": chr(25),
+    "</SPEED:5>": chr(9),  # Reset to no speed
+    
+    # Colors
+    "<C:RED>": chr(28) + "1",
+    "</C:RED>": chr(28) + "C",  # Reset to auto
+    "<C:GREEN>": chr(28) + "2",
+    "</C:GREEN>": chr(28) + "C",  # Reset to auto
+    "<C:AMBER>": chr(28) + "3",
+    "</C:AMBER>": chr(28) + "C",  # Reset to auto
+    "<C:DIMRED>": chr(28) + "4",
+    "</C:DIMRED>": chr(28) + "C",  # Reset to auto
+    "<C:DIMGREEN>": chr(28) + "5",
+    "</C:DIMGREEN>": chr(28) + "C",  # Reset to auto
+    "<C:BROWN>": chr(28) + "6",
+    "</C:BROWN>": chr(28) + "C",  # Reset to auto
+    "<C:ORANGE>": chr(28) + "7",
+    "</C:ORANGE>": chr(28) + "C",  # Reset to auto
+    "<C:YELLOW>": chr(28) + "8",
+    "</C:YELLOW>": chr(28) + "C",  # Reset to auto
+    "<C:RAIN1>": chr(28) + "9",
+    "</C:RAIN1>": chr(28) + "C",  # Reset to auto
+    "<C:RAIN2>": chr(28) + "A",
+    "</C:RAIN2>": chr(28) + "C",  # Reset to auto
+    "<C:COLORMIX>": chr(28) + "B",
+    "</C:COLORMIX>": chr(28) + "C",  # Reset to auto
+    "<C:AUTO>": chr(28) + "C",
+    "</C:AUTO>": chr(28) + "C",  # Reset to auto
+    
+    # Fonts
+    "<F:SANS5>": chr(26) + "1",
+    "<F:SANS7>": chr(26) + "3",
+    "<F:SERIF7>": chr(26) + "5",
+    "<F:SERIF16>": chr(26) + "8",
+    "<F:SANS16>": chr(26) + "9",
+    
+    # Wide modes
+    "<WIDE:ON>": chr(29) + "01",
+    "<WIDE:OFF>": chr(29) + "00",
+    "<DWIDE:ON>": chr(29) + "11",
+    "<DWIDE:OFF>": chr(29) + "10",
+    
+    # Fixed width
+    "<FIXEDWIDTH:ON>": chr(29) + "41",
+    "<FIXEDWIDTH:OFF>": chr(29) + "40",
+    "<FIXED:ON>": chr(30) + "1",
+    "<FIXED:OFF>": chr(30) + "0",
+    
+    # Other special characters
+    "<DATE>": chr(11) + "8",
+    "<TIME>": chr(19),
+    "<NOHOLD>": chr(9),
+    "\\p": chr(12),  # Page break
+    "\\n": chr(13),  # New line
+    "<STRING>": chr(16),  # String reference
+    
+    # Line positioning
+    "<LINE:TOP>": "\"",
+    "<LINE:MIDDLE>": " ",
+    "<LINE:BOTTOM>": "&",
+    "<LINE:FILL>": "0",
+}
+
+# Effect tags and their mode codes, sent after ESC and the current line
+EFFECTS = {
+    # Effects
+    "<SCROLL>": "a",
+    "<HOLD>": "b",
+    "<FLASH>": "c",
+    "<ROLL:UP>": "e",
+    "<ROLL:DOWN>": "f",
+    "<ROLL:LEFT>": "g",
+    "<ROLL:RIGHT>": "h",
+    "<ROLL:IN>": "p",
+    "<ROLL:OUT>": "q",
+    
+    "<WIPE:UP>": "i",
+    "<WIPE:DOWN>": "j",
+    "<WIPE:LEFT>": "k",
+    "<WIPE:RIGHT>": "l",
+    "<WIPE:IN>": "r",
+    "<WIPE:OUT>": "s",
+    
+    # Special effects
+    "<2LINESCROLLUP>": "m",
+    "<AUTO>": "o",
+    "<TWINKLE>": "n0",
+    "<SPARKLE>": "n1",
+    "<SNOW>": "n2",
+    "<INTERLOCK>": "n3",
+    "<SWITCH>": "n4",
+    "<SLIDE>": "n5",
+    "<SPRAY>": "n6",
+    "<STARBURST>": "n7",
+    
+    # Animations
+    "<ANIM:WELCOME>": "n8",
+    "<ANIM:SLOTS>": "n9",
+    "<ANIM:THANKYOU>": "nS",
+    "<ANIM:NOSMOKING>": "nU",
+    "<ANIM:DRINKDRIVE>": "nV",
+    "<ANIM:HORSE>": "nW",
+    "<ANIM:FIREWORKS>": "nX",
+    "<ANIM:TURBOCAR>": "nY",
+    "<ANIM:CHERRYBOMB>": "nZ",
+}
+
+# Single regex matching any tag (longest first) or a beep command
+TOKENIZER = re.compile(
+    "|".join(re.escape(tag) for tag in sorted([*TAGS, *EFFECTS], key=len, reverse=True))
+    + r"|<BEEP:(\d+)>"
+)
+
+# Extended characters (CP437 0x80-0xA8), sent as 0x08 followed by 0x20-0x48
+EXTENDED_CHARS = bytes(range(0x80, 0xA9)).decode("cp437")
+
+class CharacterTable(dict):
+    """
+    str.translate table for escape_text. Unmapped non-ASCII characters
+    are resolved on use, the most recent ones are kept in a bounded cache
+    (the table itself never grows with the text it escapes).
+    """
+    
+    def __init__(self, transliterate=False, cache_size=1024):
+        super().__init__({code: code for code in range(128)})
+        for index, char in enumerate(EXTENDED_CHARS):
+            self[ord(char)] = chr(0x08) + chr(0x20 + index)
+        self.transliterate = transliterate
+        self.resolved = LRUCache(cache_size)
+    
+    def __missing__(self, code):
+        if not self.transliterate:
+            return '_'
+        replacement = self.resolved.get(code)
+        if replacement is None:
+            # Closest ASCII spelling, e.g. 'ō' -> 'o' or 'ﬁ' -> 'fi'
+            decomposed = unicodedata.normalize('NFKD', chr(code))
+            ascii_text = ''.join(char for char in decomposed if ord(char) < 128)
+            replacement = ascii_text or '_'
+            self.resolved.put(code, replacement)
+        return replacement
+
+ESCAPE_TABLE = CharacterTable()
+TRANSLITERATE_TABLE = CharacterTable(transliterate=True)
+
 class AlphaStringProcessor:
     """
     Processes human-readable strings and converts them to Alpha sign binary commands.
@@ -96,132 +257,30 @@ class AlphaStringProcessor:
     def make_alpha(self, text):
         """
         Convert human-readable string to Alpha sign binary format.
-        This is the core function that handles all the string replacements.
+        This is the core function that handles all the string replacements,
+        done in a single pass with the tokenizer compiled at import.
         """
         if not isinstance(text, str):
             text = str(text)
         
-        # Speed controls
-        text = text.replace("<SPEED:1>", chr(21))
-        text = text.replace("</SPEED:1>", chr(9))  # Reset to no speed
-        text = text.replace("<SPEED:2>", chr(22))
-        text = text.replace("</SPEED:2>", chr(9))  # Reset to no speed
-        text = text.replace("<SPEED:3>", chr(23))
-        text = text.replace("</SPEED:3>", chr(9))  # Reset to no speed
-        text = text.replace("<SPEED:4>", chr(24))
-        text = text.replace("</SPEED:4>", chr(9))  # Reset to no speed
-        text = text.replace("<SPEED:5>", chr(25))
-        text = text.replace("</SPEED:5>", chr(9))  # Reset to no speed
-        
-        # Colors
-        text = text.replace("<C:RED>", chr(28) + "1")
-        text = text.replace("</C:RED>", chr(28) + "C")  # Reset to auto
-        text = text.replace("<C:GREEN>", chr(28) + "2")
-        text = text.replace("</C:GREEN>", chr(28) + "C")  # Reset to auto
-        text = text.replace("<C:AMBER>", chr(28) + "3")
-        text = text.replace("</C:AMBER>", chr(28) + "C")  # Reset to auto
-        text = text.replace("<C:DIMRED>", chr(28) + "4")
-        text = text.replace("</C:DIMRED>", chr(28) + "C")  # Reset to auto
-        text = text.replace("<C:DIMGREEN>", chr(28) + "5")
-        text = text.replace("</C:DIMGREEN>", chr(28) + "C")  # Reset to auto
-        text = text.replace("<C:BROWN>", chr(28) + "6")
-        text = text.replace("</C:BROWN>", chr(28) + "C")  # Reset to auto
-        text = text.replace("<C:ORANGE>", chr(28) + "7")
-        text = text.replace("</C:ORANGE>", chr(28) + "C")  # Reset to auto
-        text = text.replace("<C:YELLOW>", chr(28) + "8")
-        text = text.replace("</C:YELLOW>", chr(28) + "C")  # Reset to auto
-        text = text.replace("<C:RAIN1>", chr(28) + "9")
-        text = text.replace("</C:RAIN1>", chr(28) + "C")  # Reset to auto
-        text = text.replace("<C:RAIN2>", chr(28) + "A")
-        text = text.replace("</C:RAIN2>", chr(28) + "C")  # Reset to auto
-        text = text.replace("<C:COLORMIX>", chr(28) + "B")
-        text = text.replace("</C:COLORMIX>", chr(28) + "C")  # Reset to auto
-        text = text.replace("<C:AUTO>", chr(28) + "C")
-        text = text.replace("</C:AUTO>", chr(28) + "C")  # Reset to auto
-        
-        # Fonts
-        text = text.replace("<F:SANS5>", chr(26) + "1")
-        text = text.replace("<F:SANS7>", chr(26) + "3")
-        text = text.replace("<F:SERIF7>", chr(26) + "5")
-        text = text.replace("<F:SERIF16>", chr(26) + "8")
-        text = text.replace("<F:SANS16>", chr(26) + "9")
-        
-        # Wide modes
-        text = text.replace("<WIDE:ON>", chr(29) + "01")
-        text = text.replace("<WIDE:OFF>", chr(29) + "00")
-        text = text.replace("<DWIDE:ON>", chr(29) + "11")
-        text = text.replace("<DWIDE:OFF>", chr(29) + "10")
-        
-        # Fixed width
-        text = text.replace("<FIXEDWIDTH:ON>", chr(29) + "41")
-        text = text.replace("<FIXEDWIDTH:OFF>", chr(29) + "40")
-        text = text.replace("<FIXED:ON>", chr(30) + "1")
-        text = text.replace("<FIXED:OFF>", chr(30) + "0")
-        
-        # Effects
-        text = text.replace("<SCROLL>", chr(27) + self.current_line + "a")
-        text = text.replace("<HOLD>", chr(27) + self.current_line + "b")
-        text = text.replace("<FLASH>", chr(27) + self.current_line + "c")
-        text = text.replace("<ROLL:UP>", chr(27) + self.current_line + "e")
-        text = text.replace("<ROLL:DOWN>", chr(27) + self.current_line + "f")
-        text = text.replace("<ROLL:LEFT>", chr(27) + self.current_line + "g")
-        text = text.replace("<ROLL:RIGHT>", chr(27) + self.current_line + "h")
-        text = text.replace("<ROLL:IN>", chr(27) + self.current_line + "p")
-        text = text.replace("<ROLL:OUT>", chr(27) + self.current_line + "q")
-        
-        text = text.replace("<WIPE:UP>", chr(27) + self.current_line + "i")
-        text = text.replace("<WIPE:DOWN>", chr(27) + self.current_line + "j")
-        text = text.replace("<WIPE:LEFT>", chr(27) + self.current_line + "k")
-        text = text.replace("<WIPE:RIGHT>", chr(27) + self.current_line + "l")
-        text = text.replace("<WIPE:IN>", chr(27) + self.current_line + "r")
-        text = text.replace("<WIPE:OUT>", chr(27) + self.current_line + "s")
+        # Nothing to replace (every tag starts with '<' or '\\')
+        if '<' not in text and '\\' not in text:
+            return text
         
-        # Special effects
-        text = text.replace("<2LINESCROLLUP>", chr(27) + self.current_line + "m")
-        text = text.replace("<AUTO>", chr(27) + self.current_line + "o")
-        text = text.replace("<TWINKLE>", chr(27) + self.current_line + "n0")
-        text = text.replace("<SPARKLE>", chr(27) + self.current_line + "n1")
-        text = text.replace("<SNOW>", chr(27) + self.current_line + "n2")
-        text = text.replace("<INTERLOCK>", chr(27) + self.current_line + "n3")
-        text = text.replace("<SWITCH>", chr(27) + self.current_line + "n4")
-        text = text.replace("<SLIDE>", chr(27) + self.current_line + "n5")
-        text = text.replace("<SPRAY>", chr(27) + self.current_line + "n6")
-        text = text.replace("<STARBURST>", chr(27) + self.current_line + "n7")
+        effect = chr(27) + self.current_line
         
-        # Animations
-        text = text.replace("<ANIM:WELCOME>", chr(27) + self.current_line + "n8")
-        text = text.replace("<ANIM:SLOTS>", chr(27) + self.current_line + "n9")
-        text = text.replace("<ANIM:THANKYOU>", chr(27) + self.current_line + "nS")
-        text = text.replace("<ANIM:NOSMOKING>", chr(27) + self.current_line + "nU")
-        text = text.replace("<ANIM:DRINKDRIVE>", chr(27) + self.current_line + "nV")
-        text = text.replace("<ANIM:HORSE>", chr(27) + self.current_line + "nW")
-        text = text.replace("<ANIM:FIREWORKS>", chr(27) + self.current_line + "nX")
-        text = text.replace("<ANIM:TURBOCAR>", chr(27) + self.current_line + "nY")
-        text = text.replace("<ANIM:CHERRYBOMB>", chr(27) + self.current_line + "nZ")
+        def replace(match):
+            # Beep commands
+            beep_count = match.group(1)
+            if beep_count is not None:
+                return self.send_beep(int(beep_count))
+            
+            # Control codes, or effects (which depend on the current line)
+            tag = match.group(0)
+            code = TAGS.get(tag)
+            return code if code is not None else effect + EFFECTS[tag]
         
-        # Other special characters
-        text = text.replace("<DATE>", chr(11) + "8")
-        text = text.replace("<TIME>", chr(19))
-        text = text.replace("<NOHOLD>", chr(9))
-        text = text.replace("\\p", chr(12))  # Page break
-        text = text.replace("\\n", chr(13))  # New line
-        text = text.replace("<STRING>", chr(16))  # String reference
-        
-        # Handle beep commands
-        import re
-        beep_pattern = r'<BEEP:(\d+)>'
-        def replace_beep(match):
-            beep_count = int(match.group(1))
-            return self.send_beep(beep_count)
-        text = re.sub(beep_pattern, replace_beep, text)
-        
-        # Handle line positioning
-        text = text.replace("<LINE:TOP>", "\"")
-        text = text.replace("<LINE:MIDDLE>", " ")
-        text = text.replace("<LINE:BOTTOM>", "&")
-        text = text.replace("<LINE:FILL>", "0")
-        
-        return text
+        return TOKENIZER.sub(replace, text)
     
     def make_hex(self, num, length):
         """Create a hex number padded to the desired number of places"""
@@ -278,7 +337,7 @@ class AlphaStringProcessor:
         
         data = "E"  # Special function command
         data += chr(0x26)  # Set day of week
-        data += chr(day)
+        data += str((day + 1) % 7 + 1)  # '1' is Sunday, day is Monday=0
         return data
     
     def set_date(self, date_obj=None):
@@ -312,11 +371,14 @@ class AlphaStringProcessor:
         data += chr(0x2c)  # Soft reset
         return data
     
-    def set_memory_map(self):
-        """Set the internal memory map on the sign"""
+    def set_memory_map(self, plan=None):
+        """Set the internal memory map on the sign, from a MemoryPlan if given"""
         data = "E"  # Special function command
         data += chr(0x24)  # Memory configuration
         
+        if plan is not None:
+            return data + b"".join(plan.configs()).decode()
+        
         # Create 5 text files A-E, max 256 byte size, run time set as always
         for i in 'ABCDE':
             data += f"{i}AL0100FF00"
@@ -396,34 +458,21 @@ class AlphaStringProcessor:
         data += self.escape_text(text)
         return data
     
-    def escape_text(self, text):
-        """Convert non-ASCII characters to escaped extended characters"""
+    def escape_text(self, text, transliterate=False):
+        """
+        Convert non-ASCII characters to escaped extended characters.
+        Characters outside the extended set become '_', or their closest
+        ASCII spelling when transliterate is set.
+        """
         if not text:
             return ""
         
-        # Extended character mappings
-        extended_chars = {
-            'ä': chr(0x08) + chr(0x24),
-            'Ä': chr(0x08) + chr(0x2e),
-            'ö': chr(0x08) + chr(0x34),
-            'Ö': chr(0x08) + chr(0x39),
-            'å': chr(0x08) + chr(0x26),
-            'Å': chr(0x08) + chr(0x2f)
-        }
-        
-        escaped = text
-        for char, replacement in extended_chars.items():
-            escaped = escaped.replace(char, replacement)
-        
-        # Replace any remaining non-ASCII characters with underscore
-        result = ""
-        for char in escaped:
-            if ord(char) > 127:
-                result += '_'
-            else:
-                result += char
-        
-        return result
+        table = TRANSLITERATE_TABLE if transliterate else ESCAPE_TABLE
+        return text.translate(table)
+    
+    def escape_bytes(self, text, transliterate=False):
+        """Escape text like escape_text, as bytes ready for a packet"""
+        return self.escape_text(text, transliterate).encode('ascii')
     
     def create_packet_header(self, sign_type="Z", address="00"):
         """Create packet header for Alpha protocol"""
@@ -1,5 +1,8 @@
+import string
+
 from .packet import Packet
 from .command import Command
+from .cache import LRUCache
 
 class Text:
     # Modes (aka transitions)
@@ -233,18 +236,76 @@ class Text:
         "anim": _anim,
 
         # Counters
-        "counter": _counter
+        "counter": _counter,
+        "counter1": "\x08\x7A",
+        "counter2": "\x08\x7B",
+        "counter3": "\x08\x7C",
+        "counter4": "\x08\x7D",
+        "counter5": "\x08\x7E"
     }
 
-    def __init__(self, text):
-        self.text = Text.parse(text)
-        print(self.text.encode())
+    # Text with the control codes resolved once, and named slots for variables
+    class Template:
+        formatter = string.Formatter()
+
+        def __init__(self, template):
+            # Fields are written {{name}} (or {name}), as in parse
+            template = template.replace("{{", "{").replace("}}", "}")
+
+            # Encoded segments, with a None placeholder for each slot (index, field, conversion, spec)
+            self.segments = []
+            self.slots = []
+            literal = ""
+            for text, field, spec, conversion in self.formatter.parse(template):
+                literal += text
+                if field is None:
+                    continue
+                if field in Text.ctrl:
+                    literal += self.format(Text.ctrl[field], conversion, spec)
+                else:
+                    self.slots.append((len(self.segments) + 1, field, conversion, spec))
+                    self.segments += [literal.encode(), None]
+                    literal = ""
+            self.segments.append(literal.encode())
+
+        @property
+        def fields(self):
+            return [field for _, field, _, _ in self.slots]
+
+        def format(self, value, conversion, spec):
+            return self.formatter.format_field(self.formatter.convert_field(value, conversion), spec)
+
+        def render(self, **values):
+            # Only the slots are formatted, bytes values are inserted as is
+            parts = list(self.segments)
+            for index, field, conversion, spec in self.slots:
+                value, _ = self.formatter.get_field(field, (), values)
+                if isinstance(value, bytes) and not conversion and not spec:
+                    parts[index] = value
+                else:
+                    parts[index] = self.format(value, conversion, spec).encode()
+            return b"".join(parts)
+
+    # Compiled templates, by template text
+    templates = LRUCache(128)
+
+    def __init__(self, text, **values):
+        # Encoded text (bytes), from a template or template text
+        template = text if isinstance(text, Text.Template) else Text.compile(text)
+        self.text = template.render(**values)
+
+    @staticmethod
+    def compile(template):
+        compiled = Text.templates.get(template)
+        if compiled is None:
+            compiled = Text.Template(template)
+            Text.templates.put(template, compiled)
+        return compiled
 
     @staticmethod
-    def parse(text):
+    def parse(text, **values):
         # TODO: implement special chars
-        text = text.replace("{{", "{").replace("}}", "}")
-        return text.format_map(Text.ctrl)
+        return Text.compile(text).render(**values).decode()
 
     def to_bytes(self):
         return self.text
@@ -0,0 +1,230 @@
+import hashlib
+import math
+import time
+
+import numpy as np
+from PIL import Image as pimg
+
+from .sign import Sign
+from .image import Image
+from .packet import Packet
+from .command import Command
+from .memory import MemoryPlan
+
+# Measured link throughput (bytes per second, including the sign's pauses)
+class Throughput:
+    def __init__(self, rate=None, smoothing=0.3):
+        self.rate = rate
+        self.smoothing = smoothing
+
+    def update(self, size, seconds):
+        if seconds <= 0:
+            return
+        rate = size / seconds
+        if self.rate is None:
+            self.rate = rate
+        else:
+            self.rate += self.smoothing * (rate - self.rate)
+
+    def duration(self, size):
+        # Expected time to send size bytes, 0 until something has been measured
+        return size / self.rate if self.rate else 0.0
+
+
+# Fit a frame to size (numpy arrays are RGB, HxWx3), see Image.Fit
+def fit_frame(frame, size, fit=Image.Fit.crop, resample=pimg.BOX):
+    img = pimg.fromarray(frame) if isinstance(frame, np.ndarray) else frame
+    return Image.resize(img, size, fit, resample)
+
+
+# Last transmitted frame per label, to skip sending frames that didn't change
+class FrameHistory:
+    def __init__(self, threshold=0):
+        # Number of pixels allowed to differ for a frame to count as unchanged
+        self.threshold = threshold
+
+        # Label -> (digest, encoded frame); the frame itself is only kept for thresholds
+        self.frames = {}
+
+    @staticmethod
+    def digest(image):
+        return hashlib.blake2b(image.conv, digest_size=8).digest()
+
+    def changed(self, label, image):
+        last = self.frames.get(label)
+        if last is None:
+            return True
+        digest, conv = last
+        if digest == self.digest(image):
+            return False
+        if not self.threshold or conv is None or len(conv) != len(image.conv):
+            return True
+
+        # Count differing pixels (line ends are identical, so they never count)
+        diff = np.frombuffer(conv, dtype=np.uint8) != np.frombuffer(image.conv, dtype=np.uint8)
+        return np.count_nonzero(diff) > self.threshold
+
+    def update(self, label, image):
+        self.frames[label] = (self.digest(image), image.conv if self.threshold else None)
+
+    def forget(self, label=None):
+        # Forget one label, or all of them (eg. after a memory configuration)
+        if label is None:
+            self.frames.clear()
+        else:
+            self.frames.pop(label, None)
+
+
+# Frame pipeline: source -> fit -> quantize -> encode -> send, paced by a clock
+class Video:
+    def __init__(self, sign=None, label="A", text_label="A", size=None, fps=10, dither=None,
+                 colors="8color", clock=time.monotonic, sleep=time.sleep, buffers=None, threshold=0,
+                 fit=Image.Fit.crop):
+        self.sign = sign or Sign()
+
+        # Dots file(s) receiving the frames, and text file displaying them
+        # With several buffers, frames go to the hidden one then the text file flips to it
+        self.labels = list(buffers) if buffers else [label]
+        self.label = self.labels[0]
+        self.text_label = text_label
+
+        # Frame size, defaults to the sign's geometry
+        self.size = size or (self.sign.width, self.sign.height)
+
+        # Source frame rate, conversion and dots file colors
+        self.fps = fps
+        self.fit_mode = fit
+        self.dither = dither
+        self.colors = colors
+
+        # Frames identical to the displayed one (or within threshold pixels of it) are skipped,
+        # they are tracked by the text file showing them, whichever buffer holds them
+        self.history = FrameHistory(threshold)
+
+        # Timing
+        self.clock = clock
+        self.sleep = sleep
+        self.throughput = Throughput()
+        self.frame_size = 0
+
+        # Statistics
+        self.sent = 0
+        self.dropped = 0
+        self.skipped = 0
+
+    @property
+    def sustainable_fps(self):
+        # Frame rate the link can keep up with, capped by the source's
+        duration = self.throughput.duration(self.frame_size)
+        return min(self.fps, 1 / duration) if duration else self.fps
+
+    def setup(self):
+        # Configure the dots file(s), and the text file that shows them
+        plan = MemoryPlan()
+        for label in self.labels:
+            plan.dots(label, size=self.size, colors=self.colors)
+        plan.text(self.text_label, self.flip_command(self.labels[0]))
+        memconf = Packet()
+        memconf.add_command(plan.command())
+        self.sign.send(memconf)
+        self.history.forget()
+        self.sleep(1)
+
+        # Show the first buffer, the next frame goes to the second one
+        self.sign.send(self.flip(self.labels[0]))
+        self.label = self.labels[1 % len(self.labels)]
+
+    def fit(self, frame):
+        return fit_frame(frame, self.size, self.fit_mode)
+
+    def quantize(self, frame):
+        # Frames may already be converted (eg. from Image.batch)
+        if isinstance(frame, Image):
+            return frame
+        # Arrays already at the right size skip PIL entirely
+        if isinstance(frame, np.ndarray) and frame.shape[1::-1] == tuple(self.size):
+            return Image.from_array(frame, dither=self.dither)
+        return Image(self.fit(frame), dither=self.dither)
+
+    def encode(self, image, label=None):
+        packet = Packet()
+        packet.add_command(Command.write_small_dots(image, label=label or self.label))
+        return packet.to_bytes()
+
+    def flip_command(self, label):
+        # Tiny text file update displaying another dots file
+        return Command.write_text(f"\x14{label}", mode=b"b", label=self.text_label)
+
+    def flip(self, label):
+        packet = Packet()
+        packet.add_command(self.flip_command(label))
+        return packet.to_bytes()
+
+    def frames(self, source):
+        # Yields the converted frames that should be sent, dropping the ones
+        # that are already late or that the link has no time for
+        interval = 1 / self.fps
+        start = self.clock()
+        next_index = 0
+
+        for index, frame in enumerate(source):
+            due = start + index * interval
+            now = self.clock()
+
+            # Too early for the link, or past the next frame's time: drop it
+            if index < next_index or now >= due + interval:
+                self.dropped += 1
+                continue
+
+            # Unchanged frames leave the link free for the next ones
+            image = self.quantize(frame)
+            if not self.history.changed(self.text_label, image):
+                self.skipped += 1
+                continue
+
+            # The clock moved on since now, the frame may be due already
+            delay = due - self.clock()
+            if delay > 0:
+                self.sleep(delay)
+            yield image
+
+            # Leave the link enough time for the frame just sent
+            frames = self.throughput.duration(self.frame_size) * self.fps
+            next_index = index + max(1, math.ceil(frames - 1e-6))
+
+    def send(self, image):
+        # Upload to the current (hidden) buffer, then display it
+        data = self.encode(image)
+        start = self.clock()
+        self.sign.send(data)
+        if len(self.labels) > 1:
+            flip = self.flip(self.label)
+            self.sign.send(flip)
+            data += flip
+            self.label = self.labels[(self.labels.index(self.label) + 1) % len(self.labels)]
+        self.throughput.update(len(data), self.clock() - start)
+        self.history.update(self.text_label, image)
+        self.frame_size = len(data)
+        self.sent += 1
+
+    def play(self, source):
+        for image in self.frames(source):
+            self.send(image)
+        return {"sent": self.sent, "dropped": self.dropped, "skipped": self.skipped, "fps": self.sustainable_fps}
+
+    @staticmethod
+    def capture(path):
+        # Frames (RGB arrays) of a video file, using OpenCV
+        try:
+            import cv2
+        except ImportError:
+            raise ImportError("opencv-python is required to read video files. Install with: pip install opencv-python")
+
+        cap = cv2.VideoCapture(path)
+        try:
+            success, frame = cap.read()
+            while success:
+                yield cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                success, frame = cap.read()
+        finally:
+            cap.release()
@@ -18,6 +18,9 @@ import threading
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from alphasign import AlphaSign, Easy, Sign
+from alphasign.cache import LRUCache
+from alphasign.clock import ClockSync
+from alphasign.playlist import Playlist
 from alphasign.string_processor import AlphaStringProcessor
 
 class AlphaSignHTTPHandler(BaseHTTPRequestHandler):
@@ -25,11 +28,17 @@ class AlphaSignHTTPHandler(BaseHTTPRequestHandler):
     
     # Class-level variables to persist across requests
     sign_connection = None
-    datetime_set = False
     
-    def __init__(self, *args, **kwargs):
-        self.string_processor = AlphaStringProcessor()
-        super().__init__(*args, **kwargs)
+    # Sign clock, set in one packet and resynced only when it drifts
+    clock_sync = ClockSync()
+    
+    # Shared by all requests: the processor only builds strings, and the
+    # cache (thread-safe) maps formatting parameters to rendered messages
+    string_processor = AlphaStringProcessor()
+    message_cache = LRUCache(256)
+    
+    # Messages resident on the sign, switched with run sequences
+    playlist = Playlist()
     
     def log_message(self, format, *args):
         """Override to use our logging system"""
@@ -66,6 +75,10 @@ class AlphaSignHTTPHandler(BaseHTTPRequestHandler):
                 self.handle_display_request(query_params)
             elif path == '/dimming':
                 self.handle_dimming_request(query_params)
+            elif path == '/string':
+                self.handle_string_request(query_params)
+            elif path == '/playlist':
+                self.handle_playlist_request(query_params)
             else:
                 self.send_error(404, "Not Found")
                 
@@ -85,11 +98,15 @@ class AlphaSignHTTPHandler(BaseHTTPRequestHandler):
             line = params.get('line', ['middle'])[0]
             beep = params.get('beep', ['0'])[0]
             label = params.get('label', ['A'])[0]
+            ttl = params.get('ttl', [None])[0]
             
             if not message:
                 self.send_error(400, "Missing 'msg' parameter")
                 return
             
+            # Seconds before the sign goes back to its normal messages
+            ttl = float(ttl) if ttl else None
+            
             # Process the message
             processed_message = self.process_message(message, {
                 'color': color,
@@ -102,7 +119,7 @@ class AlphaSignHTTPHandler(BaseHTTPRequestHandler):
             })
             
             # Send to sign
-            if self.send_to_sign(processed_message, label):
+            if self.send_to_sign(processed_message, label, ttl):
                 self.send_response(200)
                 self.send_header('Content-type', 'application/json')
                 self.end_headers()
@@ -110,7 +127,8 @@ class AlphaSignHTTPHandler(BaseHTTPRequestHandler):
                     'status': 'success',
                     'message': 'Text sent to Alpha sign',
                     'original': message,
-                    'processed': processed_message
+                    'processed': processed_message,
+                    'ttl': ttl
                 }
                 self.wfile.write(json.dumps(response).encode())
             else:
@@ -121,7 +139,17 @@ class AlphaSignHTTPHandler(BaseHTTPRequestHandler):
             self.send_error(500, f"Error: {str(e)}")
     
     def process_message(self, message, params):
-        """Process the message with Alpha sign formatting"""
+        """Process the message with Alpha sign formatting, reusing cached renders"""
+        key = (message, params['color'], params['effect'], params['speed'],
+               params['font'], params['line'], params['beep'])
+        processed = self.message_cache.get(key)
+        if processed is None:
+            processed = self.render_message(message, params)
+            self.message_cache.put(key, processed)
+        return processed
+    
+    def render_message(self, message, params):
+        """Render the message with Alpha sign formatting"""
         # Start with the basic message
         processed = message
         
@@ -210,20 +238,23 @@ class AlphaSignHTTPHandler(BaseHTTPRequestHandler):
         # Process through the string processor to convert tags to binary
         return self.string_processor.make_alpha(processed)
     
-    def send_to_sign(self, message, label='A'):
-        """Send message to the Alpha sign"""
+    def connect_sign(self):
+        """Open the sign connection on first use"""
+        if not AlphaSignHTTPHandler.sign_connection:
+            AlphaSignHTTPHandler.sign_connection = AlphaSign(port='192.168.133.54:10001')
+    
+    def send_to_sign(self, message, label='A', ttl=None):
+        """Send message to the Alpha sign, cleared after ttl seconds if given"""
         try:
-            if not AlphaSignHTTPHandler.sign_connection:
-                # Initialize connection
-                AlphaSignHTTPHandler.sign_connection = AlphaSign(port='192.168.133.54:10001')
+            # Initialize connection
+            self.connect_sign()
             
-            # Only set date/time on initial connection or after reset
-            if not AlphaSignHTTPHandler.datetime_set:
-                self.set_sign_datetime()
-                AlphaSignHTTPHandler.datetime_set = True
+            # Set date/time on initial connection or after reset, then
+            # check for drift at most once per clock_sync.interval
+            self.set_sign_datetime()
             
             # Send the text
-            Easy.Text.show(message)
+            Easy.Text.show(message, ttl)
             return True
             
         except Exception as e:
@@ -233,29 +264,11 @@ class AlphaSignHTTPHandler(BaseHTTPRequestHandler):
             return True
     
     def set_sign_datetime(self):
-        """Set the current date and time on the Alpha sign"""
+        """Synchronize the sign's date and time if needed"""
         try:
-            import datetime
-            now = datetime.datetime.now()
-            
-            # Set time
-            time_cmd = self.string_processor.set_time(now)
-            self.send_raw_command(time_cmd)
-            
-            # Set weekday
-            weekday_cmd = self.string_processor.set_weekday(now.weekday())
-            self.send_raw_command(weekday_cmd)
-            
-            # Set date
-            date_cmd = self.string_processor.set_date(now)
-            self.send_raw_command(date_cmd)
-            
-            # Set time format (24-hour)
-            time_format_cmd = self.string_processor.set_time_format(ampm=False)
-            self.send_raw_command(time_format_cmd)
-            
-            logging.info(f"Set sign date/time to: {now.strftime('%Y-%m-%d %H:%M:%S')}")
-            
+            if self.clock_sync.check():
+                logging.info("Set sign date/time to: "
+                             f"{self.clock_sync.now().strftime('%Y-%m-%d %H:%M:%S')}")
         except Exception as e:
             logging.warning(f"Failed to set sign date/time: {e}")
     
@@ -266,8 +279,10 @@ class AlphaSignHTTPHandler(BaseHTTPRequestHandler):
                 # Create complete packet
                 packet = self.string_processor.create_complete_packet(command)
                 
-                # Send the packet
-                self.sign_connection.sign.write(packet.encode('latin-1'))
+                # Send the packet whole, other threads (eg. alert timers) wait for it
+                sign = self.sign_connection.sign
+                with sign.lock:
+                    sign.write(packet.encode('latin-1'))
                 return True
             else:
                 # Demo mode - log the command but don't fail
@@ -286,7 +301,8 @@ class AlphaSignHTTPHandler(BaseHTTPRequestHandler):
                 'version': '1.0.0',
                 'sign_connected': self.sign_connection is not None,
                 'available_connections': Sign.get_available_connections(),
-                'serial_available': Sign.is_serial_available()
+                'serial_available': Sign.is_serial_available(),
+                'message_cache': self.message_cache.stats()
             }
             
             self.send_response(200)
@@ -318,6 +334,10 @@ Endpoints:
 - GET /display?enabled=true&x=10&y=5&text=Hello - Display text at XY
 - GET /dimming?action=register&dim=1&brightness=80 - Set dimming register
 - GET /dimming?action=time&start=18&stop=6 - Set dimming time schedule
+- GET /string?label=1&value=42 - Update a STRING file shown by a text file (<STRING>1)
+- GET /playlist?action=add&name=news&msg=Hello - Add a message to the playlist (AlphaSign parameters apply)
+- GET /playlist?action=show&names=news,weather - Show playlist messages (all if no names)
+- GET /playlist?action=remove&name=news - Remove a message from the playlist
 
 AlphaSign Parameters:
 - msg (required): The message to display
@@ -328,12 +348,14 @@ AlphaSign Parameters:
 - line: top, middle, bottom, fill
 - beep: 0-9 (number of beeps)
 - label: A-Z (file label)
+- ttl: seconds before the sign returns to its normal messages (kept until replaced if not set)
 
 Examples:
 - /AlphaSign?msg=Hello World
 - /AlphaSign?msg=Hello&color=red&effect=flash&speed=5
 - /AlphaSign?msg=Welcome&color=green&effect=twinkle&beep=3
 - /AlphaSign?msg=Alert&color=amber&effect=hold&line=top
+- /AlphaSign?msg=Fire drill&color=red&effect=flash&ttl=60
 - /settime?time=14:30
 - /setdate?date=12/25/23
 - /sound?on=true
@@ -457,8 +479,8 @@ Features:
             # Soft reset the sign
             reset_cmd = self.string_processor.soft_reset()
             if self.send_raw_command(reset_cmd):
-                # After reset, reset the datetime flag so it gets set again on next message
-                AlphaSignHTTPHandler.datetime_set = False
+                # After reset, the sign clock is set again on next message
+                self.clock_sync.forget()
                 
                 self.send_response(200)
                 self.send_header('Content-type', 'application/json')
@@ -666,6 +688,96 @@ Features:
         except Exception as e:
             self.send_error(400, f"Invalid dimming parameters: {str(e)}")
 
+    def handle_string_request(self, params):
+        """Handle STRING file updates, a few bytes instead of a whole text file"""
+        try:
+            label = params.get('label', ['1'])[0]
+            value = params.get('value', [''])[0]
+            
+            if len(label) != 1:
+                raise ValueError("label must be a single character")
+            
+            # Write the STRING file
+            string_cmd = self.string_processor.set_string(label, value)
+            if self.send_raw_command(string_cmd):
+                self.send_response(200)
+                self.send_header('Content-type', 'application/json')
+                self.end_headers()
+                response = {
+                    'status': 'success',
+                    'message': f'String {label} updated',
+                    'label': label,
+                    'value': value
+                }
+                self.wfile.write(json.dumps(response).encode())
+            else:
+                self.send_error(500, "Failed to update string")
+                
+        except Exception as e:
+            self.send_error(400, f"Invalid string parameters: {str(e)}")
+
+    def handle_playlist_request(self, params):
+        """Handle playlist requests, messages stay on the sign and are switched by run sequence"""
+        try:
+            action = params.get('action', ['show'])[0]
+            playlist = AlphaSignHTTPHandler.playlist
+            
+            if action == 'add':
+                name = params.get('name', [''])[0]
+                message = params.get('msg', [''])[0]
+                if not name or not message:
+                    self.send_error(400, "Missing 'name' or 'msg' parameter")
+                    return
+                
+                processed_message = self.process_message(message, {
+                    'color': params.get('color', ['auto'])[0],
+                    'effect': params.get('effect', ['scroll'])[0],
+                    'speed': params.get('speed', ['3'])[0],
+                    'font': params.get('font', ['sans7'])[0],
+                    'line': params.get('line', ['middle'])[0],
+                    'beep': params.get('beep', ['0'])[0]
+                })
+                label = playlist.add(name, processed_message)
+                response = {
+                    'status': 'success',
+                    'message': f'Message {name} added',
+                    'name': name,
+                    'label': label
+                }
+            elif action == 'show':
+                names = [name for name in params.get('names', [''])[0].split(',') if name]
+                self.connect_sign()
+                uploaded = playlist.upload()
+                switched = playlist.show(*names)
+                response = {
+                    'status': 'success',
+                    'message': 'Playlist shown',
+                    'names': names or list(playlist.messages),
+                    'uploaded': uploaded,
+                    'switched': switched
+                }
+            elif action == 'remove':
+                name = params.get('name', [''])[0]
+                playlist.remove(name)
+                response = {
+                    'status': 'success',
+                    'message': f'Message {name} removed',
+                    'name': name
+                }
+            else:
+                self.send_error(400, "Invalid playlist action")
+                return
+            
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            self.wfile.write(json.dumps(response).encode())
+            
+        except KeyError as e:
+            self.send_error(404, f"Unknown playlist message: {e}")
+        except Exception as e:
+            self.send_error(500, f"Playlist operation failed: {str(e)}")
+
 class AlphaSignHTTPService:
     """Main HTTP service class"""
     
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+"""
+Image dithering benchmark
+Times each Image dither mode against plain nearest-color quantization on sign-sized frames
+"""
+
+import sys
+import os
+import time
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from PIL import Image as pimg
+from alphasign import Image
+
+# Frame sizes to test (width, height): Alpha 2X0C, Alpha 4200C and a larger panel
+SIZES = [(60, 7), (200, 16), (256, 32)]
+MODES = [
+    Image.Dither.none,
+    Image.Dither.bayer,
+    Image.Dither.floyd_steinberg,
+    Image.Dither.atkinson,
+]
+
+def make_frame(width, height, seed=0):
+    """Random noise over a horizontal gradient, the worst case for banding"""
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(0, 255, width)[np.newaxis, :, np.newaxis]
+    noise = rng.normal(0, 40, (height, width, 3))
+    return pimg.fromarray(np.clip(gradient + noise, 0, 255).astype(np.uint8))
+
+def bench(frame, dither, repeat=50):
+    """Average conversion time of one frame, in milliseconds"""
+    Image(frame, dither=dither) # Warm up (builds the lookup tables)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        Image(frame, dither=dither)
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    print("Image Dithering Benchmark")
+    print("=" * 50)
+
+    for width, height in SIZES:
+        frame = make_frame(width, height)
+        base = bench(frame, Image.Dither.none)
+        print(f"\n{width}x{height}")
+        print("-" * 30)
+        for mode in MODES:
+            ms = bench(frame, mode) if mode else base
+            print(f"{str(mode or 'none'):16} {ms:8.3f} ms  x{ms / base:5.1f}  ({1000 / ms:7.0f} fps)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+
+## Animation looped by the sign itself
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw
+from alphasign import AlphaSign, Easy
+
+sign = AlphaSign(port='/dev/ttyUSB0')
+
+# A dot bouncing across the sign, 8 frames
+frames = []
+for i in range(8):
+    frame = Image.new("RGB", (60, 7))
+    x = i * 7
+    ImageDraw.Draw(frame).ellipse((x, 1, x + 4, 5), fill=(255, 191, 0))
+    frames.append(frame)
+
+# Frames are uploaded once, then the sign animates them with no more traffic
+Easy.Image.show_animation(frames, frame_time=2)
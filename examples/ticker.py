@@ -1,4 +1,4 @@
-from alphasign import Sign, SignType, Text
+from alphasign import Sign, SignType, Text, Layout
 import time
 import yfinance as yf
 import pprint
@@ -10,9 +10,18 @@ sign.open(port="/dev/ttyUSB0")
 # Get stock data for select companies
 companies = ["AMZN", "GOOGL", "TSLA", "MSFT", "AAPL", "NFLX", "META"]
 
+# Upload the ticker once, with a STRING file per price: only changed prices are sent afterwards,
+# the values carry their color (red when down, green when up)
+template = " / ".join(
+    f"{{{{amber}}}}{company.split('.')[0]} {{{{price{i}}}}} {{{{diff{i}}}}}" for i, company in enumerate(companies)
+)
+sizes = {f"{field}{i}": 12 for i in range(len(companies)) for field in ("price", "diff")}
+layout = Layout(template, label="A", sizes=sizes, mode=Text.Mode.rotate, sign=sign)
+layout.setup()
+
 while True:
-    text = ""
-    for company in companies:
+    values = {}
+    for i, company in enumerate(companies):
         try:
             ticker = yf.Ticker(company).info
         except:
@@ -21,13 +30,11 @@ while True:
         if not ticker:
             print(f"CANNOT FIND {company}")
 
-        diff = round(ticker['previousClose'] - ticker['currentPrice'],2)
+        diff = round(ticker['currentPrice'] - ticker['previousClose'],2)
         price = ticker['currentPrice']
-        color = "{{red}}" if diff < 0 else "{{green}}"
-
-        text += f"{{amber}}{company.split('.')[0]} {color}{price} {diff} / "
+        color = Text.ctrl["red"] if diff < 0 else Text.ctrl["green"]
+        values[f"price{i}"] = f"{color}{price}".encode()
+        values[f"diff{i}"] = f"{color}{diff:+}".encode()
 
-    print(f"Updating")
-    tosend = Text(text[:-2])
-    sign.send(tosend.to_packet(label="A", mode=Text.Mode.rotate))
+    print(f"Updated {layout.update(**values)}")
     time.sleep(60)
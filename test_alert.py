@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+"""
+Test script for priority file alerts
+"""
+
+import sys
+import os
+import threading
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alphasign import Alert, Sign
+from alphasign_http_service import AlphaSignHTTPHandler
+
+class RecordingSign:
+    """Sign replacement keeping the sent packets"""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, data):
+        self.sent.append(data if isinstance(data, bytes) else data.to_bytes())
+
+class ManualTimer:
+    """threading.Timer replacement fired by the test"""
+
+    timers = []
+
+    def __init__(self, interval, function, args=()):
+        self.interval = interval
+        self.function = function
+        self.args = args
+        self.cancelled = False
+        ManualTimer.timers.append(self)
+
+    def start(self):
+        pass
+
+    def cancel(self):
+        self.cancelled = True
+
+    def fire(self):
+        self.function(*self.args)
+
+CLEAR = b"\x00" * 5 + b"\x01Z00\x02\xffA0\x04"
+
+def test_alert_expires():
+    sign = RecordingSign()
+    alert = Alert(sign, timer=ManualTimer)
+    alert.show("Fire drill", ttl=30)
+    assert sign.sent[0].endswith(b"A0\x1B0aFire drill\x04")
+    timer = ManualTimer.timers[-1]
+    assert timer.interval == 30
+
+    # Expiry clears the priority file with an empty write, nothing else is sent
+    timer.fire()
+    assert sign.sent[1:] == [CLEAR] and not alert.active
+    print("[OK] Alerts are cleared by an empty priority write after their TTL")
+
+def test_newer_alert_keeps_its_ttl():
+    sign = RecordingSign()
+    alert = Alert(sign, timer=ManualTimer)
+    alert.show("First", ttl=10)
+    first = ManualTimer.timers[-1]
+    alert.show("Second", ttl=60)
+    assert first.cancelled
+
+    # A late first timer doesn't clear the second alert
+    first.fire()
+    assert len(sign.sent) == 2
+    ManualTimer.timers[-1].fire()
+    assert sign.sent[-1] == CLEAR
+    print("[OK] A newer alert is not cleared by an older TTL")
+
+def test_manual_clear():
+    sign = RecordingSign()
+    alert = Alert(sign, timer=ManualTimer)
+    alert.show("Until cleared")
+    alert.clear()
+    assert sign.sent[1:] == [CLEAR]
+
+    # A new instance (eg. after a restart) still clears what the sign shows
+    Alert(sign, timer=ManualTimer).clear()
+    assert sign.sent[1:] == [CLEAR, CLEAR]
+    print("[OK] Alerts without TTL stay until cleared")
+
+def test_expiry_waits_for_other_packets():
+    # Real sign and timer: the TTL fires while another thread sends a packet with pauses
+    sign = Sign()
+    written = []
+    sign.write = written.append
+    try:
+        alert = Alert(timer=threading.Timer)
+        alert.show("Short", ttl=0.05)
+        expired = alert.timer
+        sign.send(b"\x01one\xfftwo\xffthree\xfffour")
+        expired.join()
+    finally:
+        del sign.write
+
+    # The clear comes whole, after the other packet
+    upload = [b"\x01one", b"two", b"three", b"four"]
+    start = written.index(upload[0])
+    assert written[start:start + 4] == upload, written
+    assert b"".join(written[start + 4:]) == CLEAR.replace(b"\xff", b"") and not alert.active
+    print("[OK] An expiring alert doesn't interleave with other packets")
+
+def test_raw_http_packets_wait_for_clears():
+    # The HTTP service writes raw packets while a timer thread clears an alert
+    sign = Sign()
+    written = []
+    started = threading.Event()
+    def write(data):
+        written.append(data)
+        started.set()
+    sign.write = write
+
+    class Connection:
+        pass
+    connection = Connection()
+    connection.sign = sign
+    handler = AlphaSignHTTPHandler.__new__(AlphaSignHTTPHandler)
+    handler.sign_connection = connection
+    try:
+        clearing = threading.Thread(target=Alert().clear)
+        clearing.start()
+        started.wait()
+        handler.send_raw_command("E!00")
+        clearing.join()
+    finally:
+        del sign.write
+
+    assert b"".join(written[:2]) == CLEAR.replace(b"\xff", b""), written
+    assert len(written) == 3 and b"\x02E!00\x03" in written[2], written
+    print("[OK] Raw HTTP packets don't interleave with alert clears")
+
+def main():
+    print("Alert Test")
+    print("=" * 40)
+    test_alert_expires()
+    test_newer_alert_keeps_its_ttl()
+    test_manual_clear()
+    test_expiry_waits_for_other_packets()
+    test_raw_http_packets_wait_for_clears()
+    print("\nAll alert tests passed!")
+
+if __name__ == '__main__':
+    main()
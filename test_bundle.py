@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+"""
+Test script for precompiled animation bundles
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from PIL import Image as pimg
+from alphasign import Image, Packet, Command
+from alphasign.bundle import Bundle
+
+class RecordingSign:
+    """Sign replacement recording what is sent, with a simulated clock"""
+
+    def __init__(self, send_time=0.0):
+        self.sent = []
+        self.now = 0.0
+        self.send_time = send_time
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += max(0, seconds)
+
+    def send(self, data):
+        self.sent.append(data if isinstance(data, bytes) else data.to_bytes())
+        self.now += self.send_time
+
+def make_frames(count=5, size=(120, 14)):
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8) for _ in range(count)]
+
+def test_build_and_load():
+    frames = make_frames()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "anim.bundle")
+        Bundle.build(path, frames, [100, 200, 100, 200, 100], (60, 7), label="B", workers=1).close()
+
+        with Bundle(path) as bundle:
+            assert (len(bundle), bundle.width, bundle.height, bundle.label) == (5, 60, 7, "B")
+            assert list(bundle.timing) == [100, 200, 100, 200, 100]
+            assert bundle.duration == 0.7
+
+            # Stored packets are exactly what would be sent for each frame
+            image = Image(pimg.fromarray(frames[2]).resize((60, 7), pimg.BOX))
+            packet = Packet()
+            packet.add_command(Command.write_small_dots(image, label="B"))
+            assert bundle[2] == packet.to_bytes()
+    print("[OK] Bundles store ready-to-send packets and timing")
+
+def test_playback_timing():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "anim.bundle")
+        with Bundle.build(path, make_frames(), [100] * 5, (60, 7), workers=1) as bundle:
+            sign = RecordingSign()
+            stats = bundle.play(sign, clock=sign.clock, sleep=sign.sleep)
+            assert stats == {"sent": 5, "dropped": 0}
+            # Memory configuration and display text, then the frames as stored
+            assert sign.sent[2:] == [bundle[i] for i in range(5)]
+
+            # A link slower than the frame time drops frames instead of drifting
+            slow = RecordingSign(send_time=0.25)
+            stats = bundle.play(slow, clock=slow.clock, sleep=slow.sleep)
+            assert stats["sent"] == 2 and stats["dropped"] == 3, stats
+    print("[OK] Playback follows the frame timing")
+
+def test_read_animated_gif():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "anim.gif")
+        images = [pimg.fromarray(frame) for frame in make_frames(3)]
+        images[0].save(path, save_all=True, append_images=images[1:], duration=[50, 150, 250])
+        frames, durations = Bundle.read_frames(path)
+        assert len(frames) == 3 and durations == [50, 150, 250]
+    print("[OK] Animated GIF frames and durations are read")
+
+def test_rejects_other_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "anim.bundle")
+        Bundle.build(path, make_frames(2), [100, 100], (60, 7), workers=1).close()
+        with open(path, "rb") as f:
+            data = f.read()
+
+        # Other files, empty or truncated bundles, without leaking their file handles
+        fds = len(os.listdir("/proc/self/fd")) if os.path.isdir("/proc/self/fd") else None
+        for content in (b"not a bundle" * 4, b"", data[:10], data[:Bundle.header.size], data[:-1]):
+            bad = os.path.join(tmp, "bad.bundle")
+            with open(bad, "wb") as f:
+                f.write(content)
+            try:
+                Bundle(bad)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"Bad bundle accepted: {content[:16]!r}")
+        if fds is not None:
+            assert len(os.listdir("/proc/self/fd")) == fds
+    print("[OK] Non-bundle and truncated files are rejected")
+
+def main():
+    print("Animation Bundle Test")
+    print("=" * 40)
+    test_build_and_load()
+    test_playback_timing()
+    test_read_animated_gif()
+    test_rejects_other_files()
+    print("\nAll bundle tests passed!")
+
+if __name__ == '__main__':
+    main()
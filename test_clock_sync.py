@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+"""
+Test the sign clock synchronization without a sign
+"""
+
+import sys
+import os
+import datetime
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alphasign import ClockSync
+from alphasign.packet import Packet
+from alphasign.string_processor import AlphaStringProcessor
+
+NOW = datetime.datetime(2024, 3, 5, 14, 32, 10)  # A Tuesday
+
+class ClockSign:
+    """Records packets and answers time reads with its own clock"""
+    def __init__(self, time=b"1432"):
+        self.time = time
+        self.sent = []
+        self.requests = 0
+
+    def send(self, packet):
+        self.sent.append(packet.to_bytes())
+
+    def request(self, packet, timeout=3):
+        self.requests += 1
+        if self.time is None:
+            return None
+        return Packet.parse(b"\x00" * 5 + b"\x01Z00\x02E\x20" + self.time + b"\x04")
+
+class Clock:
+    def __init__(self):
+        self.time = 0
+
+    def __call__(self):
+        return self.time
+
+def make(sign, clock):
+    return ClockSync(sign, threshold=2, interval=60, now=lambda: NOW, clock=clock)
+
+def test_single_packet():
+    sign = ClockSign()
+    sync = make(sign, Clock())
+    assert sync.check()
+    assert len(sign.sent) == 1
+    data = sign.sent[0]
+    assert data.count(b"\x02") == 4
+    for command in (b"E\x201432", b"E&3", b"E;030524", b"E'M"):
+        assert command in data.replace(b"\xff", b""), command
+    assert sign.requests == 0
+    print("[OK] Time, day, date and format are sent in one packet")
+
+def test_checks_once_per_interval():
+    sign = ClockSign()
+    clock = Clock()
+    sync = make(sign, clock)
+    sync.check()
+    clock.time = 30
+    assert not sync.check()
+    assert sign.requests == 0
+    clock.time = 61
+    assert not sync.check()
+    assert (sign.requests, len(sign.sent)) == (1, 1)
+    clock.time = 90
+    assert not sync.check()
+    assert sign.requests == 1
+    print("[OK] The sign clock is read back once per interval, not resent when on time")
+
+def test_drift_resyncs():
+    sign = ClockSign(b"1429")
+    clock = Clock()
+    sync = make(sign, clock)
+    sync.check()
+    assert sync.drift() == -3
+    clock.time = 61
+    assert sync.check()
+    assert len(sign.sent) == 2
+    sign.time = None
+    clock.time = 200
+    assert sync.check()
+    assert len(sign.sent) == 3
+    print("[OK] Drift past the threshold (or no answer) resyncs")
+
+def test_drift_wraps_midnight():
+    sign = ClockSign(b"0001")
+    sync = ClockSync(sign, now=lambda: datetime.datetime(2024, 3, 5, 23, 59))
+    assert sync.drift() == 2
+    print("[OK] Drift is measured across midnight")
+
+def test_forget():
+    sign = ClockSign()
+    clock = Clock()
+    sync = make(sign, clock)
+    sync.check()
+    sync.forget()
+    assert sync.check()
+    assert len(sign.sent) == 2
+    print("[OK] A forgotten clock is set on the next check")
+
+def test_weekday_code():
+    processor = AlphaStringProcessor()
+    assert processor.set_weekday(6) == "E&1"  # Sunday
+    assert processor.set_weekday(1) == "E&3"  # Tuesday
+    print("[OK] Weekdays are sent as ASCII day codes")
+
+def main():
+    print("Clock Sync Test")
+    print("=" * 40)
+    test_single_packet()
+    test_checks_once_per_interval()
+    test_drift_resyncs()
+    test_drift_wraps_midnight()
+    test_forget()
+    test_weekday_code()
+    print("\nAll clock sync tests passed!")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+"""
+Test script for animations looped by the sign
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from PIL import Image as pimg
+from alphasign import Easy, Image, ImageCache, SignState
+
+class RecordingSign:
+    """Sign replacement keeping the sent packets"""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, data):
+        self.sent.append(data if isinstance(data, bytes) else data.to_bytes())
+
+def frame(seed, size=(60, 7)):
+    rng = np.random.default_rng(seed)
+    return pimg.fromarray(rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8))
+
+def show_animations(sign):
+    """Shows animations through Easy, checking what is sent"""
+    Easy.Image.show_animation([frame(0), frame(1)], frame_time=10)
+    anim = b"\x1FL        B000A" + b"\x1FL        C000A"
+    assert len(sign.sent) == 4  # memory, two frames, text
+
+    # A dots file per frame, skipping the text file's label, and a text file sized for the animation
+    assert sign.sent[0].endswith(b"E$BCL073C8000CCL073C8000AAL0021FF00\x04")
+    assert b"\x02\xffIB073C" in sign.sent[1] and b"\x02\xffIC073C" in sign.sent[2]
+    assert sign.sent[3].endswith(b"AA\x1B0b" + anim + b"\x04")
+
+    # Same animation: the sign already loops it
+    Easy.Image.show_animation([frame(0), frame(1)], frame_time=10)
+    assert len(sign.sent) == 4
+
+    # One frame changed: only that picture
+    Easy.Image.show_animation([frame(0), frame(2)], frame_time=10)
+    assert len(sign.sent) == 5 and b"\x02\xffIC073C" in sign.sent[4]
+
+def test_show_animation():
+    sign = RecordingSign()
+    cache, state = Easy.Image.cache, Easy.Image.state
+    with tempfile.TemporaryDirectory() as tmp:
+        Easy.Image.cache = ImageCache(os.path.join(tmp, "cache"))
+        Easy.Image.state = SignState(sign, sleep=lambda s: None)
+        try:
+            show_animations(sign)
+        finally:
+            Easy.Image.cache, Easy.Image.state = cache, state
+    print("[OK] Animations upload each frame once and loop on the sign")
+
+def test_too_many_frames():
+    try:
+        Easy.Image.show_animation([Image(frame(0))] * 3, labels="BC")
+    except ValueError:
+        print("[OK] Animations need a label per frame")
+    else:
+        raise AssertionError("More frames than labels accepted")
+
+def main():
+    print("Easy Animation Test")
+    print("=" * 40)
+    test_show_animation()
+    test_too_many_frames()
+    print("\nAll animation tests passed!")
+
+if __name__ == '__main__':
+    main()
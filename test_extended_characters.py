@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+"""
+Test script for extended character escaping
+"""
+
+import sys
+import os
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alphasign.string_processor import AlphaStringProcessor, CharacterTable, EXTENDED_CHARS
+
+def reference_escape(text):
+    """Original escaping, limited to six characters"""
+    extended_chars = {
+        'ä': chr(0x08) + chr(0x24),
+        'Ä': chr(0x08) + chr(0x2e),
+        'ö': chr(0x08) + chr(0x34),
+        'Ö': chr(0x08) + chr(0x39),
+        'å': chr(0x08) + chr(0x26),
+        'Å': chr(0x08) + chr(0x2f)
+    }
+    for char, replacement in extended_chars.items():
+        text = text.replace(char, replacement)
+    return ''.join('_' if ord(char) > 127 else char for char in text)
+
+def test_original_characters():
+    processor = AlphaStringProcessor()
+    text = "Hello äöå ÄÖÅ\tplain ASCII ~{}"
+    assert processor.escape_text(text) == reference_escape(text)
+    print("[OK] Previously supported characters are unchanged")
+
+def test_full_extended_set():
+    processor = AlphaStringProcessor()
+    escaped = processor.escape_text(EXTENDED_CHARS)
+    assert escaped == ''.join(chr(0x08) + chr(code) for code in range(0x20, 0x49))
+    assert processor.escape_text("Café ñ ¿£") == "Caf\x08\x22 \x08\x44 \x08\x48\x08\x3c"
+    print(f"[OK] All {len(EXTENDED_CHARS)} extended characters are escaped")
+
+def test_fallbacks():
+    processor = AlphaStringProcessor()
+    assert processor.escape_text("ō€") == "__"
+    assert processor.escape_text("ō€ ﬁ", transliterate=True) == "o_ fi"
+    # Characters of the extended set are escaped, not transliterated
+    assert processor.escape_text("Ü", transliterate=True) == "\x08\x3a"
+    print("[OK] Unknown characters fall back to '_' or transliteration")
+
+def test_tables_stay_bounded():
+    for transliterate in (False, True):
+        table = CharacterTable(transliterate, cache_size=16)
+        size = len(table)
+        text = ''.join(chr(code) for code in range(0x4E00, 0x4E00 + 500))
+        text.translate(table)
+        assert len(table) == size
+        assert len(table.resolved) <= 16
+    print("[OK] Unknown characters don't grow the escape tables")
+
+def test_bytes():
+    processor = AlphaStringProcessor()
+    assert processor.escape_bytes("Hä") == b"H\x08\x24"
+    assert processor.escape_bytes("") == b""
+    print("[OK] Escaped text is produced as bytes")
+
+def main():
+    print("Extended Characters Test")
+    print("=" * 40)
+    test_original_characters()
+    test_full_extended_set()
+    test_fallbacks()
+    test_tables_stay_bounded()
+    test_bytes()
+    print("\nAll extended character tests passed!")
+
+if __name__ == '__main__':
+    main()
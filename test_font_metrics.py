@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+"""
+Test the font metrics width and display time estimates
+"""
+
+import sys
+import os
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alphasign import FontMetrics, Playlist, Text
+
+class RecordingSign:
+    """Sign replacement keeping the sent packets"""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, data):
+        self.sent.append(data if isinstance(data, bytes) else data.to_bytes())
+
+def test_glyph_widths():
+    metrics = FontMetrics(width=80)
+    # H e l l o: 5 + 5 + 2 + 2 + 5 and a blank column between glyphs
+    assert metrics.width("Hello") == 23
+    assert metrics.width("") == 0
+    assert metrics.width(Text("{{spacefixed}}Hello")) == 29
+    assert metrics.width(Text("{{wide}}Hello")) == 47
+    print("[OK] Widths come from the glyph tables, spacing and wide codes")
+
+def test_fonts_and_lines():
+    metrics = FontMetrics(width=80)
+    small = metrics.width(Text._font("5h-std") + "WIDE")
+    big = metrics.width(Text._font("fh-std") + "WIDE")
+    assert (small, big) == (17, 32), (small, big)
+    assert metrics.width(Text("Hi{{nl}}Hello")) == 23
+    assert len(metrics.pages(Text("Hi{{np}}Hello"))) == 2
+    print("[OK] Font changes, lines and pages are measured separately")
+
+def test_fields():
+    metrics = FontMetrics(width=80)
+    assert metrics.width(Text("{{time}}")) == metrics.width("00:00")
+    assert metrics.width("\x101") == 0
+    metrics.strings["1"] = "Hello"
+    metrics.pictures["A"] = 16
+    assert metrics.width("\x101") == 23
+    assert metrics.width("\x14A") == 16
+    print("[OK] Time, STRING and picture fields are measured from their contents")
+
+def test_mode_and_duration():
+    metrics = FontMetrics(width=40, hold=4)
+    assert metrics.mode("Hello") == Text.Mode.hold
+    assert metrics.mode("Hello world") == Text.Mode.rotate
+    assert metrics.duration("Hello", Text.Mode.hold) == 4
+    # Fastest speed by default: 30 columns per second over the sign and the text
+    assert metrics.duration("Hello") == (40 + 23) / 30
+    assert metrics.duration(Text._speed(1) + "Hello") == (40 + 23) / 10
+    assert metrics.duration(b"\x1b0bHi\x1b0aHello") == 4 + (40 + 23) / 30
+    print("[OK] Modes fit the sign and durations follow mode and speed")
+
+def test_playlist():
+    playlist = Playlist(RecordingSign(), sleep=lambda s: None, metrics=FontMetrics(width=40, hold=4))
+    playlist.add("short", "Hello", mode=None)
+    playlist.add("long", "Hello world", mode=None)
+    assert playlist.messages["short"][1].mode == Text.Mode.hold
+    assert playlist.messages["long"][1].mode == Text.Mode.rotate
+    long = playlist.metrics.duration("Hello world")
+    assert playlist.duration() == 4 + long
+    assert playlist.duration("long") == long
+    print("[OK] Playlists pick modes and predict their cycle time")
+
+def main():
+    print("Font Metrics Test")
+    print("=" * 40)
+    test_glyph_widths()
+    test_fonts_and_lines()
+    test_fields()
+    test_mode_and_duration()
+    test_playlist()
+    print("\nAll font metrics tests passed!")
+
+if __name__ == '__main__':
+    main()
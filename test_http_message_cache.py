@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+"""
+Test the HTTP service message cache without running the server
+"""
+
+import sys
+import os
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alphasign_http_service import AlphaSignHTTPHandler
+
+def make_handler():
+    """Handler without a request, enough to call process_message"""
+    return AlphaSignHTTPHandler.__new__(AlphaSignHTTPHandler)
+
+def params(**overrides):
+    base = {'color': 'red', 'effect': 'scroll', 'speed': '3', 'font': 'sans7',
+            'line': 'middle', 'beep': '0', 'label': 'A'}
+    base.update(overrides)
+    return base
+
+def test_processor_is_shared():
+    assert make_handler().string_processor is make_handler().string_processor
+    print("[OK] Requests share one string processor")
+
+def test_repeated_messages_hit_cache():
+    AlphaSignHTTPHandler.message_cache.clear()
+    first = make_handler().process_message("Hello", params())
+    again = make_handler().process_message("Hello", params())
+    stats = AlphaSignHTTPHandler.message_cache.stats()
+    assert first == again
+    assert (stats['hits'], stats['misses']) == (1, 1), stats
+    print("[OK] Repeated messages are served from the cache")
+
+def test_parameters_are_part_of_key():
+    AlphaSignHTTPHandler.message_cache.clear()
+    handler = make_handler()
+    red = handler.process_message("Hello", params())
+    green = handler.process_message("Hello", params(color='green'))
+    beep = handler.process_message("Hello", params(beep='2'))
+    assert len({red, green, beep}) == 3
+    assert red == handler.render_message("Hello", params())
+    assert AlphaSignHTTPHandler.message_cache.stats()['misses'] == 3
+    print("[OK] Formatting parameters select different cache entries")
+
+def main():
+    print("HTTP Message Cache Test")
+    print("=" * 40)
+    test_processor_is_shared()
+    test_repeated_messages_hit_cache()
+    test_parameters_are_part_of_key()
+    print("\nAll message cache tests passed!")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the on-disk converted image cache
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from PIL import Image as pimg
+from alphasign import Image, ImageCache
+
+def write_image(path, seed=0, size=(60, 7)):
+    rng = np.random.default_rng(seed)
+    pimg.fromarray(rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)).save(path)
+
+def test_cache_hit_skips_decoding():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ImageCache(os.path.join(tmp, "cache"))
+        path = os.path.join(tmp, "img.png")
+        write_image(path)
+
+        first = Image(path, cache=cache)
+        assert first.orig is not None
+
+        second = Image(path, cache=cache)
+        assert second.orig is None, "cache hit should not decode the image"
+        assert (second.width, second.height, second.conv) == (first.width, first.height, first.conv)
+    print("[OK] Cache hit returns the converted image without decoding")
+
+def test_key_covers_parameters():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ImageCache(os.path.join(tmp, "cache"))
+        path = os.path.join(tmp, "img.png")
+        write_image(path)
+
+        Image(path, cache=cache)
+        dithered = Image(path, cache=cache, dither=Image.Dither.bayer)
+        assert dithered.orig is not None, "a different dither mode must not hit"
+
+        # Rewriting the file changes its signature
+        write_image(path, seed=1, size=(61, 7))
+        changed = Image(path, cache=cache)
+        assert changed.orig is not None and changed.width == 61
+    print("[OK] Cache key covers dither mode and file changes")
+
+def test_content_hash_mode():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ImageCache(os.path.join(tmp, "cache"), hash_content=True)
+        first, second = os.path.join(tmp, "a.png"), os.path.join(tmp, "b.png")
+        write_image(first)
+        write_image(second)
+
+        Image(first, cache=cache)
+        assert Image(second, cache=cache).orig is None, "same content should hit"
+    print("[OK] Content hashing shares entries between identical files")
+
+def test_lru_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ImageCache(os.path.join(tmp, "cache"), max_size=3 * (60 * 8 + cache_header()))
+        for i in range(3):
+            cache.put(f"{i:064x}", 60, 8, b"0" * 60 * 8)
+            os.utime(cache.entry_path(f"{i:064x}"), (i, i))
+
+        # Touch the oldest entry, then add one more: the second one goes
+        assert cache.get(f"{0:064x}") is not None
+        cache.put(f"{3:064x}", 60, 8, b"0" * 60 * 8)
+
+        assert cache.get(f"{1:064x}") is None
+        assert cache.get(f"{0:064x}") is not None
+        assert cache.size() <= cache.max_size
+    print("[OK] Least recently used entries are evicted past the size cap")
+
+def test_bad_entries_are_misses():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ImageCache(os.path.join(tmp, "cache"))
+        for i, data in enumerate((b"", b"ASI", b"JUNK" + b"\0" * 8)):
+            key = f"{i:064x}"
+            os.makedirs(os.path.dirname(cache.entry_path(key)), exist_ok=True)
+            with open(cache.entry_path(key), "wb") as f:
+                f.write(data)
+            assert cache.get(key) is None
+            assert not os.path.exists(cache.entry_path(key))
+    print("[OK] Truncated and foreign entries are deleted misses")
+
+def test_eviction_is_batched():
+    with tempfile.TemporaryDirectory() as tmp:
+        entry = 60 * 8 + cache_header()
+        cache = ImageCache(os.path.join(tmp, "cache"), max_size=10 * entry)
+        scans = []
+        entries = cache.entries
+        cache.entries = lambda: scans.append(1) or entries()
+        for i in range(20):
+            cache.put(f"{i:064x}", 60, 8, b"0" * 60 * 8)
+        assert cache.total == cache.size() <= cache.max_size
+        # First put scans, then one scan per eviction (each frees a batch)
+        assert len(scans) < 20 // 2, len(scans)
+    print("[OK] Cache size is tracked incrementally and evicted in batches")
+
+def cache_header():
+    return ImageCache.header.size
+
+def main():
+    print("Image Cache Test")
+    print("=" * 40)
+    test_cache_hit_skips_decoding()
+    test_key_covers_parameters()
+    test_content_hash_mode()
+    test_lru_eviction()
+    test_bad_entries_are_misses()
+    test_eviction_is_batched()
+    print("\nAll image cache tests passed!")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+
+"""
+Test script for Image conversion and dithering modes
+"""
+
+import sys
+import os
+import math
+import tempfile
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from PIL import Image as pimg
+from alphasign import Image
+from alphasign.image import FrameBatch
+
+def reference_convert(img):
+    """Original per-pixel nearest color conversion"""
+    conv = b""
+    for y in range(img.height):
+        for x in range(img.width):
+            r, g, b = img.getpixel((x, y))
+            distances = {index: math.sqrt((r - pr) ** 2 + (g - pg) ** 2 + (b - pb) ** 2) for (pr, pg, pb), index in Image.palette.items()}
+            conv += min(distances, key=distances.get).encode()
+        conv += b"\x0D"
+    return conv
+
+def random_frame(width=60, height=7, seed=0):
+    rng = np.random.default_rng(seed)
+    return pimg.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8))
+
+def test_plain_matches_reference():
+    """Plain quantization must stay byte-identical to the per-pixel version"""
+    for seed in range(3):
+        frame = random_frame(seed=seed)
+        assert Image(frame).conv == reference_convert(frame)
+    print("[OK] Plain quantization matches reference conversion")
+
+def test_palette_colors_are_exact():
+    """Pure palette colors map to themselves in every mode"""
+    colors = list(Image.palette.keys())
+    row = np.array([colors * 4], dtype=np.uint8)
+    frame = pimg.fromarray(np.repeat(row, 7, axis=0))
+    expected = ("".join(Image.palette.values()) * 4).encode() + b"\x0D"
+    for mode in [None, Image.Dither.floyd_steinberg, Image.Dither.atkinson]:
+        assert Image(frame, dither=mode).conv == expected * 7, mode
+    print("[OK] Palette colors are preserved by all modes")
+
+def test_dither_layout():
+    """Dithered output keeps the size and line layout of plain output"""
+    frame = random_frame(37, 5)
+    for mode in [Image.Dither.bayer, Image.Dither.floyd_steinberg, Image.Dither.atkinson]:
+        conv = Image(frame, dither=mode).conv
+        lines = conv.split(b"\x0D")
+        assert len(lines) == 6 and lines[-1] == b""
+        assert all(len(line) == 37 for line in lines[:-1])
+        assert set(conv) <= set(b"012345678\x0D")
+    print("[OK] Dithered output has the expected layout")
+
+def test_dither_mixes_colors():
+    """A flat color between two palette entries gets a pattern, not a single color"""
+    frame = pimg.new("RGB", (60, 7), (128, 0, 0))
+    assert len(set(Image(frame).conv) - {0x0D}) == 1
+    for mode in [Image.Dither.bayer, Image.Dither.floyd_steinberg, Image.Dither.atkinson]:
+        assert len(set(Image(frame, dither=mode).conv) - {0x0D}) > 1, mode
+    print("[OK] Dithering mixes palette colors")
+
+def test_unknown_dither():
+    try:
+        Image(random_frame(), dither="halftone")
+    except ValueError:
+        print("[OK] Unknown dither mode is rejected")
+    else:
+        raise AssertionError("Unknown dither mode accepted")
+
+def test_batch_matches_single_conversion():
+    frames = [np.asarray(random_frame(seed=seed)) for seed in range(6)]
+    expected = [Image(pimg.fromarray(frame), dither=Image.Dither.atkinson).conv for frame in frames]
+
+    batch = Image.batch(frames, dither=Image.Dither.atkinson, workers=2)
+    assert (len(batch), batch.width, batch.height) == (6, 60, 7)
+    assert [img.conv for img in batch] == expected
+
+    # Written to a memory-mappable file, and loaded back
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "frames.npy")
+        Image.batch(frames, dither=Image.Dither.atkinson, workers=2, path=path)
+        loaded = FrameBatch.load(path)
+        assert isinstance(loaded.payloads, np.memmap)
+        assert [img.conv for img in loaded] == expected
+        del loaded
+    print("[OK] Batch conversion matches single frame conversion")
+
+def test_batch_rejects_mixed_sizes():
+    try:
+        Image.batch([np.asarray(random_frame()), np.asarray(random_frame(30, 7))], workers=1)
+    except ValueError:
+        print("[OK] Batch conversion rejects mixed frame sizes")
+    else:
+        raise AssertionError("Mixed frame sizes accepted")
+
+def test_batch_failure_releases_shared_memory():
+    from multiprocessing import shared_memory
+    import alphasign.image
+
+    class Failing(Image):
+        def quantize(self, pixels, dither=None):
+            raise RuntimeError("conversion failed")
+
+    created = []
+    original = shared_memory.SharedMemory
+    class Recording(original):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            if kwargs.get("create"):
+                created.append(self.name)
+
+    alphasign.image.shared_memory.SharedMemory = Recording
+    try:
+        Failing.batch([np.asarray(random_frame())], workers=1)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("Conversion error swallowed")
+    finally:
+        alphasign.image.shared_memory.SharedMemory = original
+
+    assert len(created) == 2
+    for name in created:
+        try:
+            shared_memory.SharedMemory(name=name).close()
+        except FileNotFoundError:
+            continue
+        raise AssertionError(f"Shared memory {name} leaked")
+    print("[OK] A failed batch conversion releases its shared memory")
+
+def test_from_array_and_buffer():
+    frame = random_frame(seed=4)
+    pixels = np.asarray(frame)
+    expected = Image(frame, dither=Image.Dither.bayer).conv
+
+    img = Image.from_array(pixels, dither=Image.Dither.bayer)
+    assert (img.width, img.height, img.conv) == (60, 7, expected)
+    assert img.orig is None
+    assert Image(pixels, dither=Image.Dither.bayer).conv == expected
+
+    # Raw buffers, BGR channel order and alpha channels
+    assert Image.from_buffer(memoryview(pixels.tobytes()), 60, 7, dither=Image.Dither.bayer).conv == expected
+    assert Image.from_array(np.ascontiguousarray(pixels[..., ::-1]), dither=Image.Dither.bayer, bgr=True).conv == expected
+    rgba = np.dstack([pixels, np.full((7, 60), 255, dtype=np.uint8)])
+    assert Image.from_buffer(rgba.tobytes(), 60, 7, dither=Image.Dither.bayer, channels=4).conv == expected
+
+    try:
+        Image.from_array(pixels.astype(np.float32))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Float array accepted")
+    print("[OK] Arrays and raw buffers convert like PIL images")
+
+def test_fit_modes():
+    wide = pimg.new("RGB", (120, 7), (255, 0, 0))
+    wide.paste((0, 255, 0), (0, 0, 30, 7))
+    tall = pimg.new("RGB", (20, 20), (255, 0, 0))
+
+    assert (Image(wide, fit=Image.Fit.stretch, size=(60, 7)).width) == 60
+    contained = Image(wide, fit=Image.Fit.contain, size=(60, 7))
+    assert (contained.width, contained.height) == (60, 4)
+
+    # Cropping keeps the center: the green left quarter is cut off
+    cropped = Image(tall, fit=Image.Fit.crop, size=(60, 7))
+    assert (cropped.width, cropped.height) == (60, 7)
+    assert set(Image(wide, fit=Image.Fit.crop, size=(30, 7)).conv) == set(b"1\x0D")
+
+    # Letterboxing pads with black around the scaled image
+    boxed = Image(tall, fit=Image.Fit.letterbox, size=(60, 7))
+    lines = boxed.conv.split(b"\x0D")[:-1]
+    assert all(line.startswith(b"0" * 27) and line.endswith(b"0" * 26) for line in lines), lines
+    assert all(line[27:34] == b"1" * 7 for line in lines)
+    print("[OK] Images are fitted with each mode")
+
+def test_resampling_cache():
+    Image.resized_cache.clear()
+    source = random_frame(120, 40, seed=7)
+    first = Image(source, fit=Image.Fit.crop, size=(60, 7))
+    again = Image(source, fit=Image.Fit.crop, size=(60, 7))
+    other = Image(source, fit=Image.Fit.crop, size=(30, 7))
+    stats = Image.resized_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 2, 2), stats
+    assert first.conv == again.conv and other.width == 30
+    print("[OK] Resampling is cached per source and geometry")
+
+def main():
+    print("Image Conversion Test")
+    print("=" * 40)
+    test_plain_matches_reference()
+    test_palette_colors_are_exact()
+    test_dither_layout()
+    test_dither_mixes_colors()
+    test_unknown_dither()
+    test_batch_matches_single_conversion()
+    test_from_array_and_buffer()
+    test_fit_modes()
+    test_resampling_cache()
+    test_batch_rejects_mixed_sizes()
+    test_batch_failure_releases_shared_memory()
+    print("\nAll image conversion tests passed!")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+"""
+Test script for STRING file layouts
+"""
+
+import sys
+import os
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alphasign import Layout, Playlist, Command, Packet
+
+class RecordingSign:
+    """Sign replacement keeping the sent packets"""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, data):
+        self.sent.append(data if isinstance(data, bytes) else data.to_bytes())
+
+def make_layout(sign):
+    return Layout("{{amber}}AMZN {{price}} {{diff:+}} / {{price}}", label="A",
+                  sizes={"price": 8}, sign=sign, sleep=lambda s: None)
+
+def test_write_string_command():
+    packet = Packet()
+    packet.add_command(Command.write_string("12.5", label="1"))
+    assert packet.to_bytes() == b"\x00" * 5 + b"\x01Z00\x02\xffG112.5\x04"
+    print("[OK] Write STRING command")
+
+def test_layout_text():
+    layout = make_layout(RecordingSign())
+    assert layout.labels == {"price": "1", "diff": "2"}
+    assert layout.text() == b"\x1C3AMZN \x101 \x102 / \x101"
+    print("[OK] Fields become STRING references")
+
+def test_setup_and_updates():
+    sign = RecordingSign()
+    layout = make_layout(sign)
+    layout.setup(price=12.5, diff=-1)
+    memconf, text, values = sign.sent
+    assert b"AAL0014FF00" in memconf and b"1BL00080000" in memconf and b"2BL00200000" in memconf
+    assert text.endswith(b"A\x1B0b\x1C3AMZN \x101 \x102 / \x101\x04")
+    assert b"G112.5\x03" in values and b"G2-1\x03" in values
+
+    # Only changed values are sent, as small packets
+    sign.sent.clear()
+    assert layout.update(price=12.5, diff=2) == ["diff"]
+    assert sign.sent == [b"\x00" * 5 + b"\x01Z00\x02\xffG2+2\x04"]
+    assert layout.update(price=12.5, diff=2) == [] and len(sign.sent) == 1
+
+    # Values are truncated to their STRING file size
+    layout.update(price="123456789")
+    assert sign.sent[-1].endswith(b"G112345678\x04")
+    print("[OK] Layout is uploaded once and only changed values are sent")
+
+def test_text_file_holds_the_write_command():
+    # Sized like playlist files: the text plus the ESC, position and mode it is written with
+    layout = make_layout(RecordingSign())
+    size = layout.memory_plan().files["A", "text"][0]
+    assert size == len(layout.text()) + 3
+
+    playlist = Playlist(RecordingSign(), sleep=lambda s: None)
+    playlist.add("ticker", layout.text(), mode=layout.mode, label="A")
+    assert playlist.memory_plan().files["A", "text"][0] == size
+    print("[OK] Layout text files have room for the mode header")
+
+def test_unknown_field():
+    layout = make_layout(RecordingSign())
+    try:
+        layout.update(volume=3)
+    except KeyError:
+        print("[OK] Unknown fields are rejected")
+    else:
+        raise AssertionError("Unknown field accepted")
+
+def main():
+    print("Layout Test")
+    print("=" * 40)
+    test_write_string_command()
+    test_layout_text()
+    test_setup_and_updates()
+    test_text_file_holds_the_write_command()
+    test_unknown_field()
+    print("\nAll layout tests passed!")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the memory planner and read special functions
+"""
+
+import sys
+import os
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alphasign import MemoryPlan, MemoryPlanner, Packet, Command
+from alphasign.string_processor import AlphaStringProcessor
+
+class FakeSign:
+    """Sign replacement answering read requests with canned packets"""
+
+    def __init__(self, responses=None):
+        self.sent = []
+        self.responses = list(responses or [])
+
+    def send(self, data):
+        self.sent.append(data if isinstance(data, bytes) else data.to_bytes())
+
+    def request(self, data, timeout=3):
+        self.send(data)
+        return Packet.parse(self.responses.pop(0)) if self.responses else None
+
+def make_plan(text="Hello"):
+    return MemoryPlan().text("A", text).string("1", size=10).dots("B", size=(60, 7), colors="8color")
+
+def test_plan_sizes():
+    plan = make_plan()
+    assert plan.configs() == [b"AAL0005FF00", b"1BL000A0000", b"BCL073C8000"]
+    assert plan.footprint("B", "dots") == 210 and plan.total() == 5 + 10 + 210
+    assert MemoryPlan().text("A", "\x10" + "1", slack=3).configs() == [b"AAL0005FF00"]
+    try:
+        MemoryPlan().string("1", size=200)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Oversized STRING file accepted")
+    print("[OK] Files are sized from their content")
+
+def test_applied_only_when_changed():
+    sign = FakeSign()
+    planner = MemoryPlanner(sign, sleep=lambda s: None)
+    assert planner.apply(make_plan())
+    assert not planner.apply(make_plan())
+    assert len(sign.sent) == 1 and sign.sent[0].endswith(b"E$AAL0005FF001BL000A0000BCL073C8000\x04")
+    assert planner.apply(make_plan("Hello world"))
+    planner.forget()
+    assert planner.apply(make_plan("Hello world"))
+    assert len(sign.sent) == 3
+    print("[OK] Memory is only reconfigured when the plan changes")
+
+def test_capacity():
+    sign = FakeSign([b"\x00" * 5 + b"\x01000\x02E#00C8\x03" + b"0000\x04"])
+    planner = MemoryPlanner(sign, sleep=lambda s: None)
+    assert planner.read_capacity() == 200
+    assert sign.sent[0].endswith(b"F#\x04")
+    try:
+        planner.apply(make_plan())
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Plan over capacity accepted")
+    assert planner.apply(MemoryPlan().text("A", "Hello"))
+    print("[OK] Plans must fit the sign's memory size")
+
+def test_parse_responses():
+    response = Packet.parse(b"\x00\x00\x00\x01000\x02E$AAL0100FF00BCL073C8000\x03" + b"1234\x04")
+    assert (response.type, response.addr) == (b"0", b"00")
+    command = response.commands[0]
+    assert command.code == b"E" and command.checksum
+    assert Command.read_special_functions.parse_memory_config(command.to_bytes()) == [
+        ("A", "text", "locked", 256, "FF00"),
+        ("B", "dots", "locked", (60, 7), "8000"),
+    ]
+    print("[OK] Sign responses are parsed")
+
+def test_string_processor_memory_map():
+    processor = AlphaStringProcessor()
+    assert processor.set_memory_map(make_plan()) == "E$AAL0005FF001BL000A0000BCL073C8000"
+    assert processor.set_memory_map().startswith("E$AAL0100FF00")
+    print("[OK] String processor uses memory plans")
+
+def main():
+    print("Memory Planner Test")
+    print("=" * 40)
+    test_plan_sizes()
+    test_applied_only_when_changed()
+    test_capacity()
+    test_parse_responses()
+    test_string_processor_memory_map()
+    print("\nAll memory planner tests passed!")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+"""
+Test script for run sequence playlists
+"""
+
+import sys
+import os
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alphasign import Playlist, Command, Text
+
+class RecordingSign:
+    """Sign replacement keeping the sent packets"""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, data):
+        self.sent.append(data if isinstance(data, bytes) else data.to_bytes())
+
+def make_playlist(sign):
+    playlist = Playlist(sign, sleep=lambda s: None)
+    playlist.add("news", "Hello")
+    playlist.add("weather", Text("{{red}}Sunny"), mode=Text.Mode.hold)
+    return playlist
+
+def test_special_function_data():
+    command = Command.write_special_functions()
+    command.set_run_sequence("AB")
+    assert command.to_bytes() == b".TUAB"
+    command.set_time_format("military")
+    assert command.to_bytes() == b"'M"
+    print("[OK] Special functions carry their data")
+
+def test_messages_uploaded_once():
+    sign = RecordingSign()
+    playlist = make_playlist(sign)
+    assert playlist.upload() == ["news", "weather"]
+    assert sign.sent[0].endswith(b"E$AAL0008FF00BAL000AFF00\x04")
+    assert sign.sent[2].endswith(b"AB\x1B0b\x1C1Sunny\x04")
+    assert playlist.upload() == []
+    assert len(sign.sent) == 3
+    print("[OK] Messages are uploaded once, each in its own file")
+
+def test_switching_sends_run_sequence():
+    sign = RecordingSign()
+    playlist = make_playlist(sign)
+    assert playlist.show("weather")
+    sent = len(sign.sent)
+    assert sign.sent[-1] == b"\x00" * 5 + b"\x01Z00\x02\xffE.TUB\x04"
+
+    # Switching only sends the run sequence
+    assert playlist.show("news", "weather")
+    assert len(sign.sent) == sent + 1 and sign.sent[-1].endswith(b"E.TUAB\x04")
+    assert not playlist.show()
+
+    # Changing a message re-uploads it only
+    playlist.add("news", "Hallo")
+    assert playlist.upload() == ["news"]
+    print("[OK] Switching messages sends a run sequence only")
+
+def test_unknown_message():
+    playlist = make_playlist(RecordingSign())
+    try:
+        playlist.show("sports")
+    except KeyError:
+        print("[OK] Unknown messages are rejected")
+    else:
+        raise AssertionError("Unknown message accepted")
+
+def main():
+    print("Playlist Test")
+    print("=" * 40)
+    test_special_function_data()
+    test_messages_uploaded_once()
+    test_switching_sends_run_sequence()
+    test_unknown_message()
+    print("\nAll playlist tests passed!")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+"""
+Test script for on-sign schedules
+"""
+
+import sys
+import os
+import datetime
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alphasign import Schedule, Packet
+
+class RecordingSign:
+    """Sign replacement keeping the sent packets"""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, data):
+        self.sent.append(data if isinstance(data, bytes) else data.to_bytes())
+
+def make_schedule(sign):
+    schedule = Schedule(sign, sleep=lambda s: None)
+    schedule.add("breakfast", "Breakfast", "07:00", "10:30", days="weekdays")
+    schedule.add("brunch", "Brunch", datetime.time(10, 0), datetime.time(14, 0), days=("saturday", "sunday"))
+    schedule.add("welcome", "Welcome")
+    return schedule
+
+def test_codes():
+    assert Schedule.time_code("00:00") == "00"
+    assert Schedule.time_code("07:00") == "2A"
+    assert Schedule.time_code("23:59") == "8F"
+    assert Schedule.time_code("24:00") == "00"
+    assert Schedule.day_codes("weekdays") == ("8", "8")
+    assert Schedule.day_codes(("monday", "friday")) == ("2", "6")
+    try:
+        Schedule.day_codes("someday")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unknown day accepted")
+    print("[OK] Times and days are encoded for the run tables")
+
+def test_windows_ending_at_midnight():
+    schedule = Schedule(RecordingSign(), sleep=lambda s: None)
+    schedule.add("late", "Late", "22:00", "24:00")
+    schedule.add("day", "Day", "00:00", "24:00", days="weekends")
+    assert schedule.times["late"] == ("84", "00", "0", "0")
+    assert schedule.times["day"] == ("FD", "00", "9", "9")
+    print("[OK] Run windows can end at midnight")
+
+def test_install_once():
+    sign = RecordingSign()
+    schedule = make_schedule(sign)
+    assert schedule.install() == ["A", "B", "C"]
+
+    # Memory, three messages, the run tables nested in one packet, and the run sequence
+    assert len(sign.sent) == 6
+    tables = [command.to_bytes() for command in Packet.parse(sign.sent[4]).commands]
+    assert tables == [b")A2A3F", b"2A88", b")B3C54", b"2B71", b")CFF00", b"2C00"]
+    assert sign.sent[5].endswith(b"E.TUABC\x04")
+
+    # Installed: nothing left to send
+    assert schedule.install() == []
+    assert len(sign.sent) == 6
+    print("[OK] Schedule is uploaded once")
+
+def test_schedule_change():
+    sign = RecordingSign()
+    schedule = make_schedule(sign)
+    schedule.install()
+    sent = len(sign.sent)
+
+    # New times for the same message: only its tables are sent
+    schedule.add("breakfast", "Breakfast", "06:30", "10:30", days="weekdays")
+    assert schedule.install() == ["A"]
+    assert len(sign.sent) == sent + 1
+    print("[OK] Changing a schedule only sends its run tables")
+
+def main():
+    print("Schedule Test")
+    print("=" * 40)
+    test_codes()
+    test_windows_ending_at_midnight()
+    test_install_once()
+    test_schedule_change()
+    print("\nAll schedule tests passed!")
+
+if __name__ == '__main__':
+    main()
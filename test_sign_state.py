@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the host-side sign state mirror
+"""
+
+import sys
+import os
+import tempfile
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from PIL import Image as pimg
+from alphasign import Easy, Image, ImageCache, MemoryPlan, SignState, Command, Packet
+from alphasign.packet import RawCommand
+
+class RecordingSign:
+    """Sign replacement keeping the sent packets"""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, data):
+        self.sent.append(data if isinstance(data, bytes) else data.to_bytes())
+
+class SimulatedSign(RecordingSign):
+    """Sign replacement keeping its files in memory, and answering read requests"""
+
+    def __init__(self):
+        super().__init__()
+        self.configs = b""
+        self.files = {}
+
+    def send(self, data):
+        super().send(data)
+        for command in Packet.parse(self.sent[-1]).commands:
+            data = command.to_bytes()
+            if command.code == b"E" and data[:1] == b"$":
+                self.configs = data[1:]
+                self.files.clear()
+            elif command.code in b"AGI":
+                self.files[command.code, data[:1]] = data[1:].replace(b"\xFF", b"")
+
+    def request(self, data, timeout=3):
+        command = Packet.parse(data.to_bytes()).commands[0]
+        data = command.to_bytes()
+        if command.code == b"F":
+            answer = RawCommand(b"E", b"#1000" if data == b"#" else b"$" + self.configs)
+        else:
+            code = {b"B": b"A", b"H": b"G", b"J": b"I"}[command.code]
+            answer = RawCommand(code, data + self.files.get((code, data), b""))
+        response = Packet("0", "00")
+        response.add_command(answer)
+        return Packet.parse(response.to_bytes())
+
+def frame(seed, size=(60, 7)):
+    rng = np.random.default_rng(seed)
+    return pimg.fromarray(rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8))
+
+def test_allocate_merges_files():
+    sign = RecordingSign()
+    state = SignState(sign, sleep=lambda s: None)
+    text = Command.write_text("x", label="A")
+    assert state.allocate(MemoryPlan().text("A", size=4))
+    state.upload(text)
+    assert not state.allocate(MemoryPlan().text("A", size=4))
+    assert state.resident(text)
+
+    # A new file reconfigures memory with every file, and forgets their content
+    assert state.allocate(MemoryPlan().dots("B", size=(60, 7)))
+    assert sign.sent[-1].endswith(b"E$AAL0004FF00BCL073C8000\x04")
+    assert not state.resident(text)
+    print("[OK] Memory is only reconfigured for new or changed files")
+
+def test_upload_skips_resident_content():
+    sign = RecordingSign()
+    state = SignState(sign)
+    assert state.upload(Command.write_string("hello", label="1"))
+    assert not state.upload(Command.write_string("hello", label="1"))
+    assert state.upload(Command.write_string("world", label="1"))
+    # Same text with another mode is different content
+    assert state.upload(Command.write_text("hello", label="A", mode=b"a"))
+    assert state.upload(Command.write_text("hello", label="A", mode=b"b"))
+    state.forget("1")
+    assert state.upload(Command.write_string("world", label="1"))
+    assert len(sign.sent) == 5 and sign.sent[-1].endswith(b"G1world\x04")
+    print("[OK] Content already on the sign is not uploaded again")
+
+def show_images(sign):
+    """Shows images through Easy, checking what is sent"""
+    Easy.Image.show(frame(0), img_label="B", text_label="A")
+    assert len(sign.sent) == 3  # memory, picture, text
+
+    # Same image: nothing to send
+    Easy.Image.show(frame(0), img_label="B", text_label="A")
+    assert len(sign.sent) == 3
+
+    # Another image in the same file: only the picture
+    Easy.Image.show(frame(1), img_label="B", text_label="A")
+    assert len(sign.sent) == 4 and b"\x02\xffIB" in sign.sent[-1]
+
+    # Another file: memory grows, so everything is sent again
+    Easy.Image.show(frame(1), img_label="C", text_label="A")
+    assert len(sign.sent) == 7 and b"E$" in sign.sent[4]
+
+def test_easy_image_show():
+    sign = RecordingSign()
+    cache, state = Easy.Image.cache, Easy.Image.state
+    with tempfile.TemporaryDirectory() as tmp:
+        Easy.Image.cache = ImageCache(os.path.join(tmp, "cache"))
+        Easy.Image.state = SignState(sign, sleep=lambda s: None)
+        try:
+            show_images(sign)
+        finally:
+            Easy.Image.cache, Easy.Image.state = cache, state
+    print("[OK] Easy.Image.show only uploads what changed")
+
+def test_easy_image_default_labels():
+    # Picture and text file both labelled "A", as in examples/easy_image.py
+    sign = RecordingSign()
+    cache, state = Easy.Image.cache, Easy.Image.state
+    with tempfile.TemporaryDirectory() as tmp:
+        Easy.Image.cache = ImageCache(os.path.join(tmp, "cache"))
+        Easy.Image.state = SignState(sign, sleep=lambda s: None)
+        try:
+            path = os.path.join(tmp, "image.png")
+            frame(0).save(path)
+            Easy.Image.show(path)
+            assert len(sign.sent) == 3
+            assert b"E$ACL073C8000AAL0005FF00\x04" in sign.sent[0]
+            assert b"\x02\xffIA" in sign.sent[1] and sign.sent[2].endswith(b"AA\x1b0b\x14A\x04")
+
+            # Both files are known to hold their content
+            Easy.Image.show(path)
+            assert len(sign.sent) == 3
+        finally:
+            Easy.Image.cache, Easy.Image.state = cache, state
+    print("[OK] Easy.Image.show keeps a picture and a text file with the same label")
+
+def test_resync():
+    sign = SimulatedSign()
+    pictures = [Image(frame(seed)) for seed in range(2)]
+    commands = [Command.write_small_dots(pictures[0], label="B"),
+                Command.write_small_dots(pictures[1], label="C"),
+                Command.write_text("\x14B", mode=b"b", label="A")]
+    plan = MemoryPlan().dots("B", pictures[0]).dots("C", pictures[1]).text("A", size=8)
+
+    first = SignState(sign, sleep=lambda s: None)
+    first.allocate(plan)
+    for command in commands:
+        first.upload(command)
+
+    # A fresh mirror (eg. after a restart) reads everything back, then only sends differences
+    sign.sent.clear()
+    state = SignState(sign, sleep=lambda s: None)
+    assert state.resync().configs() == plan.configs()
+    assert state.planner.capacity == 0x1000 and set(state.contents) == {("A", "text"), ("B", "dots"), ("C", "dots")}
+    sent = len(sign.sent)
+    assert not state.allocate(plan)
+    assert not any(state.upload(command) for command in commands)
+    assert len(sign.sent) == sent
+    assert state.upload(Command.write_text("\x14C", mode=b"b", label="A"))
+    assert len(sign.sent) == sent + 1
+    print("[OK] Resync rebuilds the mirror from the sign's memory")
+
+def main():
+    print("Sign State Test")
+    print("=" * 40)
+    test_allocate_merges_files()
+    test_upload_skips_resident_content()
+    test_easy_image_show()
+    test_easy_image_default_labels()
+    test_resync()
+    print("\nAll sign state tests passed!")
+
+if __name__ == '__main__':
+    main()
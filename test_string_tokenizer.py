@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the make_alpha tag tokenizer
+"""
+
+import sys
+import os
+import random
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alphasign.string_processor import AlphaStringProcessor, TAGS, EFFECTS
+
+def reference_make_alpha(self, text):
+    """Original sequential replacement version of make_alpha"""
+    if not isinstance(text, str):
+        text = str(text)
+    
+    # Speed controls
+    text = text.replace("<SPEED:1>", chr(21))
+    text = text.replace("</SPEED:1>", chr(9))  # Reset to no speed
+    text = text.replace("<SPEED:2>", chr(22))
+    text = text.replace("</SPEED:2>", chr(9))  # Reset to no speed
+    text = text.replace("<SPEED:3>", chr(23))
+    text = text.replace("</SPEED:3>", chr(9))  # Reset to no speed
+    text = text.replace("<SPEED:4>", chr(24))
+    text = text.replace("</SPEED:4>", chr(9))  # Reset to no speed
+    text = text.replace("<SPEED:5>", chr(25))
+    text = text.replace("</SPEED:5>", chr(9))  # Reset to no speed
+    
+    # Colors
+    text = text.replace("<C:RED>", chr(28) + "1")
+    text = text.replace("</C:RED>", chr(28) + "C")  # Reset to auto
+    text = text.replace("<C:GREEN>", chr(28) + "2")
+    text = text.replace("</C:GREEN>", chr(28) + "C")  # Reset to auto
+    text = text.replace("<C:AMBER>", chr(28) + "3")
+    text = text.replace("</C:AMBER>", chr(28) + "C")  # Reset to auto
+    text = text.replace("<C:DIMRED>", chr(28) + "4")
+    text = text.replace("</C:DIMRED>", chr(28) + "C")  # Reset to auto
+    text = text.replace("<C:DIMGREEN>", chr(28) + "5")
+    text = text.replace("</C:DIMGREEN>", chr(28) + "C")  # Reset to auto
+    text = text.replace("<C:BROWN>", chr(28) + "6")
+    text = text.replace("</C:BROWN>", chr(28) + "C")  # Reset to auto
+    text = text.replace("<C:ORANGE>", chr(28) + "7")
+    text = text.replace("</C:ORANGE>", chr(28) + "C")  # Reset to auto
+    text = text.replace("<C:YELLOW>", chr(28) + "8")
+    text = text.replace("</C:YELLOW>", chr(28) + "C")  # Reset to auto
+    text = text.replace("<C:RAIN1>", chr(28) + "9")
+    text = text.replace("</C:RAIN1>", chr(28) + "C")  # Reset to auto
+    text = text.replace("<C:RAIN2>", chr(28) + "A")
+    text = text.replace("</C:RAIN2>", chr(28) + "C")  # Reset to auto
+    text = text.replace("<C:COLORMIX>", chr(28) + "B")
+    text = text.replace("</C:COLORMIX>", chr(28) + "C")  # Reset to auto
+    text = text.replace("<C:AUTO>", chr(28) + "C")
+    text = text.replace("</C:AUTO>", chr(28) + "C")  # Reset to auto
+    
+    # Fonts
+    text = text.replace("<F:SANS5>", chr(26) + "1")
+    text = text.replace("<F:SANS7>", chr(26) + "3")
+    text = text.replace("<F:SERIF7>", chr(26) + "5")
+    text = text.replace("<F:SERIF16>", chr(26) + "8")
+    text = text.replace("<F:SANS16>", chr(26) + "9")
+    
+    # Wide modes
+    text = text.replace("<WIDE:ON>", chr(29) + "01")
+    text = text.replace("<WIDE:OFF>", chr(29) + "00")
+    text = text.replace("<DWIDE:ON>", chr(29) + "11")
+    text = text.replace("<DWIDE:OFF>", chr(29) + "10")
+    
+    # Fixed width
+    text = text.replace("<FIXEDWIDTH:ON>", chr(29) + "41")
+    text = text.replace("<FIXEDWIDTH:OFF>", chr(29) + "40")
+    text = text.replace("<FIXED:ON>", chr(30) + "1")
+    text = text.replace("<FIXED:OFF>", chr(30) + "0")
+    
+    # Effects
+    text = text.replace("<SCROLL>", chr(27) + self.current_line + "a")
+    text = text.replace("<HOLD>", chr(27) + self.current_line + "b")
+    text = text.replace("<FLASH>", chr(27) + self.current_line + "c")
+    text = text.replace("<ROLL:UP>", chr(27) + self.current_line + "e")
+    text = text.replace("<ROLL:DOWN>", chr(27) + self.current_line + "f")
+    text = text.replace("<ROLL:LEFT>", chr(27) + self.current_line + "g")
+    text = text.replace("<ROLL:RIGHT>", chr(27) + self.current_line + "h")
+    text = text.replace("<ROLL:IN>", chr(27) + self.current_line + "p")
+    text = text.replace("<ROLL:OUT>", chr(27) + self.current_line + "q")
+    
+    text = text.replace("<WIPE:UP>", chr(27) + self.current_line + "i")
+    text = text.replace("<WIPE:DOWN>", chr(27) + self.current_line + "j")
+    text = text.replace("<WIPE:LEFT>", chr(27) + self.current_line + "k")
+    text = text.replace("<WIPE:RIGHT>", chr(27) + self.current_line + "l")
+    text = text.replace("<WIPE:IN>", chr(27) + self.current_line + "r")
+    text = text.replace("<WIPE:OUT>", chr(27) + self.current_line + "s")
+    
+    # Special effects
+    text = text.replace("<2LINESCROLLUP>", chr(27) + self.current_line + "m")
+    text = text.replace("<AUTO>", chr(27) + self.current_line + "o")
+    text = text.replace("<TWINKLE>", chr(27) + self.current_line + "n0")
+    text = text.replace("<SPARKLE>", chr(27) + self.current_line + "n1")
+    text = text.replace("<SNOW>", chr(27) + self.current_line + "n2")
+    text = text.replace("<INTERLOCK>", chr(27) + self.current_line + "n3")
+    text = text.replace("<SWITCH>", chr(27) + self.current_line + "n4")
+    text = text.replace("<SLIDE>", chr(27) + self.current_line + "n5")
+    text = text.replace("<SPRAY>", chr(27) + self.current_line + "n6")
+    text = text.replace("<STARBURST>", chr(27) + self.current_line + "n7")
+    
+    # Animations
+    text = text.replace("<ANIM:WELCOME>", chr(27) + self.current_line + "n8")
+    text = text.replace("<ANIM:SLOTS>", chr(27) + self.current_line + "n9")
+    text = text.replace("<ANIM:THANKYOU>", chr(27) + self.current_line + "nS")
+    text = text.replace("<ANIM:NOSMOKING>", chr(27) + self.current_line + "nU")
+    text = text.replace("<ANIM:DRINKDRIVE>", chr(27) + self.current_line + "nV")
+    text = text.replace("<ANIM:HORSE>", chr(27) + self.current_line + "nW")
+    text = text.replace("<ANIM:FIREWORKS>", chr(27) + self.current_line + "nX")
+    text = text.replace("<ANIM:TURBOCAR>", chr(27) + self.current_line + "nY")
+    text = text.replace("<ANIM:CHERRYBOMB>", chr(27) + self.current_line + "nZ")
+    
+    # Other special characters
+    text = text.replace("<DATE>", chr(11) + "8")
+    text = text.replace("<TIME>", chr(19))
+    text = text.replace("<NOHOLD>", chr(9))
+    text = text.replace("\\p", chr(12))  # Page break
+    text = text.replace("\\n", chr(13))  # New line
+    text = text.replace("<STRING>", chr(16))  # String reference
+    
+    # Handle beep commands
+    import re
+    beep_pattern = r'<BEEP:(\d+)>'
+    def replace_beep(match):
+        beep_count = int(match.group(1))
+        return self.send_beep(beep_count)
+    text = re.sub(beep_pattern, replace_beep, text)
+    
+    # Handle line positioning
+    text = text.replace("<LINE:TOP>", "\"")
+    text = text.replace("<LINE:MIDDLE>", " ")
+    text = text.replace("<LINE:BOTTOM>", "&")
+    text = text.replace("<LINE:FILL>", "0")
+    
+    return text
+
+def random_text(rng, count=30):
+    """Random mix of tags, beeps, tag fragments and plain text"""
+    pieces = list(TAGS) + list(EFFECTS) + ["<BEEP:3>", "<BEEP:12>", "<BEEP:0>", "<BEEP:>",
+                                           "<", ">", "\\", "p", "n", ":", "<C:", "SCROLL>", "Hello", " ", "0"]
+    return "".join(rng.choice(pieces) for _ in range(count))
+
+def test_matches_reference():
+    """Single pass output is identical to the sequential replacements"""
+    rng = random.Random(0)
+    processor = AlphaStringProcessor()
+    for line in [processor.LINE_TOP, processor.LINE_MIDDLE, processor.LINE_BOTTOM, processor.LINE_FILL]:
+        processor.set_current_line(line)
+        for _ in range(500):
+            text = random_text(rng)
+            assert processor.make_alpha(text) == reference_make_alpha(processor, text), repr(text)
+    print("[OK] Tokenizer matches sequential replacements")
+
+def test_every_tag():
+    processor = AlphaStringProcessor()
+    for tag in list(TAGS) + list(EFFECTS):
+        text = f"a{tag}b"
+        assert processor.make_alpha(text) == reference_make_alpha(processor, text), tag
+    print(f"[OK] All {len(TAGS) + len(EFFECTS)} tags convert like before")
+
+def test_plain_text():
+    processor = AlphaStringProcessor()
+    assert processor.make_alpha("Hello World") == "Hello World"
+    assert processor.make_alpha(42) == "42"
+    print("[OK] Plain text passes through unchanged")
+
+def main():
+    print("String Tokenizer Test")
+    print("=" * 40)
+    test_matches_reference()
+    test_every_tag()
+    test_plain_text()
+    print("\nAll tokenizer tests passed!")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the host-side TrueType text renderer
+"""
+
+import sys
+import os
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from alphasign import Image, TextRenderer
+
+def lines_of(image):
+    return image.conv.split(b"\x0D")[:-1]
+
+def test_render_layout():
+    renderer = TextRenderer(height=7, color="red")
+    image = renderer.render("Hi 42")
+    lines = lines_of(image)
+    assert isinstance(image, Image)
+    assert image.height == 7 and len(lines) == 7
+    assert all(len(line) == image.width for line in lines)
+    assert image.width == renderer.width("Hi 42")
+    assert set(image.conv) == set(b"01\x0D"), set(image.conv)
+    print(f"[OK] Text renders to a {image.width}x{image.height} red dots picture")
+
+def test_glyph_atlas_is_reused():
+    renderer = TextRenderer(height=7, color="green")
+    renderer.render("12:00")
+    atlas = dict(renderer.atlas)
+    assert set(atlas) == set("120:")
+
+    # Changing values only blit cached glyphs
+    renderer.render("21:10")
+    assert set(renderer.atlas) == set("120:")
+    assert all(renderer.atlas[c] is atlas[c] for c in atlas)
+
+    # Renderers with the same font, size and color share the atlas
+    assert TextRenderer(height=7, color="green").atlas is renderer.atlas
+    assert TextRenderer(height=7, color="red").atlas is not renderer.atlas
+    print("[OK] Glyphs are rasterized once per font, size and color")
+
+def test_rendering_matches_glyphs():
+    renderer = TextRenderer(height=7, color="amber", spacing=2)
+    image = renderer.render("ab")
+    pixels = np.frombuffer(image.conv, dtype=np.uint8).reshape(7, image.width + 1)[:, :-1]
+    a, b = renderer.glyph("a"), renderer.glyph("b")
+    assert (pixels[:, :a.shape[1]] == a).all()
+    assert (pixels[:, a.shape[1]:a.shape[1] + 2] == ord("0")).all()
+    assert (pixels[:, a.shape[1] + 2:] == b).all()
+    print("[OK] Rendered text is the glyphs side by side")
+
+def test_empty_text():
+    image = TextRenderer(height=7, color="red").render("")
+    assert (image.width, image.height) == (1, 7)
+    assert lines_of(image) == [b"0"] * 7
+    print("[OK] Empty text renders a blank column")
+
+def test_colors():
+    assert TextRenderer.palette_code("yellow") == b"8"
+    assert TextRenderer.palette_code((250, 10, 10)) == b"1"
+    assert TextRenderer.palette_code("5") == b"5"
+    try:
+        TextRenderer.palette_code("purple")
+    except ValueError:
+        print("[OK] Colors are mapped to palette codes")
+    else:
+        raise AssertionError("Unknown color accepted")
+
+def main():
+    print("Text Renderer Test")
+    print("=" * 40)
+    test_render_layout()
+    test_glyph_atlas_is_reused()
+    test_rendering_matches_glyphs()
+    test_empty_text()
+    test_colors()
+    print("\nAll text renderer tests passed!")
+
+if __name__ == '__main__':
+    main()
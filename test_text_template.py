@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+"""
+Test script for compiled Text templates
+"""
+
+import sys
+import os
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from alphasign import Text
+
+def reference_parse(text):
+    """Original parse, formatting the whole text every time"""
+    text = text.replace("{{", "{").replace("}}", "}")
+    return text.format_map(Text.ctrl)
+
+def test_parse_matches_reference():
+    for text in ["{{red}}Hello{{green}}World!", "{{red}}{{time}}", "plain text", "{amber}A{{nl}}B{np}",
+                 "{{{{red}}}}", "{{red!r}}", "{{mix:>6}}x", "Visitors: {{counter3}}", ""]:
+        assert Text.parse(text) == reference_parse(text), text
+    print("[OK] Parse output matches the original formatting")
+
+def test_slots():
+    template = Text.compile("{{amber}}{{name}} {{color}}{{price:.2f}} / ")
+    assert template.fields == ["name", "color", "price"]
+    rendered = template.render(name="AMZN", color=Text.ctrl["red"], price=12.5)
+    assert rendered == b"\x1C3AMZN \x1C112.50 / "
+    # Bytes values are inserted as is
+    assert template.render(name=b"\x08\x24", color="", price=1) == b"\x1C3\x08\x24 1.00 / "
+    assert Text(template, name="X", color="", price=0).to_bytes() == b"\x1C3X 0.00 / "
+    try:
+        template.render(name="AMZN")
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("Missing slot value accepted")
+    print("[OK] Named slots are filled on render")
+
+def test_encoded_type():
+    template = Text.compile("{{red}}{{value}}")
+    for text in (Text("{{red}}Hi"), Text("{{red}}{{value}}", value="Hi"), Text(template, value="Hi")):
+        assert text.to_bytes() == b"\x1C1Hi", text.to_bytes()
+    print("[OK] Texts are encoded to bytes from template text or compiled templates")
+
+def test_compiled_once():
+    Text.templates.clear()
+    first = Text.compile("{{red}}{{value}}")
+    assert Text.compile("{{red}}{{value}}") is first
+    Text("{{green}}same")
+    Text("{{green}}same")
+    stats = Text.templates.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2), stats
+    print("[OK] Templates are compiled once")
+
+def main():
+    print("Text Template Test")
+    print("=" * 40)
+    test_parse_matches_reference()
+    test_slots()
+    test_encoded_type()
+    test_compiled_once()
+    print("\nAll text template tests passed!")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the video frame pipeline, using a simulated clock and link
+"""
+
+import sys
+import os
+
+# Add the current directory to the path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from alphasign.video import Video, Throughput, FrameHistory
+
+class SimulatedLink:
+    """Sign replacement that takes len(data) / rate seconds of simulated time per send"""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.now = 0.0
+        self.sent = []
+        self.width, self.height = 60, 7
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += max(0, seconds)
+
+    def send(self, data):
+        data = data if isinstance(data, bytes) else data.to_bytes()
+        self.sent.append(data)
+        self.now += len(data) / self.rate
+
+def frames(count, size=(120, 40)):
+    rng = np.random.default_rng(0)
+    for _ in range(count):
+        yield rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)
+
+def make_video(link, fps):
+    return Video(link, size=(60, 7), fps=fps, clock=link.clock, sleep=link.sleep)
+
+def test_fast_link_sends_everything():
+    link = SimulatedLink(rate=1_000_000)
+    stats = make_video(link, fps=10).play(frames(20))
+    assert stats["sent"] == 20 and stats["dropped"] == 0
+    # Paced by the source clock, not as fast as possible
+    assert abs(link.now - 1.9) < 0.1, link.now
+    print("[OK] Fast link sends every frame at the source rate")
+
+def test_slow_link_drops_frames():
+    # ~450 bytes per frame at 900 bytes/s is about 2fps for a 30fps source
+    link = SimulatedLink(rate=900)
+    video = make_video(link, fps=30)
+    stats = video.play(frames(90))
+    assert stats["sent"] + stats["dropped"] == 90
+    assert 4 <= stats["sent"] <= 8, stats
+    assert 1.5 < stats["fps"] < 2.5, stats
+    # Playback didn't drift behind the 3 second source
+    assert link.now < 3.0 + 2 * len(link.sent[-1]) / link.rate
+    print(f"[OK] Slow link drops frames: {stats}")
+
+def test_frames_are_fitted():
+    link = SimulatedLink(rate=1_000_000)
+    video = make_video(link, fps=10)
+    image = next(video.frames(frames(1, size=(320, 240))))
+    assert (image.width, image.height) == (60, 7)
+    assert len(image.conv) == 61 * 7
+    print("[OK] Frames are fitted to the video size")
+
+def test_double_buffering():
+    link = SimulatedLink(rate=1_000_000)
+    video = Video(link, size=(60, 7), fps=10, clock=link.clock, sleep=link.sleep, buffers="AB")
+    video.setup()
+    assert link.sent[0].count(b"AC") == 1 and link.sent[0].count(b"BC") == 1
+    # Text file shown always, with two hex digits start and stop times
+    assert link.sent[0].endswith(f"{video.text_label}AL0005FF00\x04".encode())
+    assert link.sent[1].endswith(b"A\x1B0b\x14A\x04")
+    link.sent.clear()
+
+    video.play(frames(4))
+    # Each frame is written to the hidden buffer, then displayed
+    uploads = [data[12:13] for data in link.sent[0::2]]
+    flips = [data[-2:-1] for data in link.sent[1::2]]
+    assert uploads == [b"B", b"A", b"B", b"A"], uploads
+    assert flips == uploads, flips
+    assert all(b"\x14" in data for data in link.sent[1::2])
+    print("[OK] Double buffering alternates labels and flips the text file")
+
+def test_unchanged_frames_are_skipped():
+    link = SimulatedLink(rate=1_000_000)
+    first, second, third = frames(3)
+    stats = make_video(link, fps=10).play([first] * 5 + [second, third])
+    assert stats["sent"] == 3 and stats["skipped"] == 4, stats
+    print("[OK] Identical frames are skipped")
+
+def test_history_threshold():
+    video = make_video(SimulatedLink(rate=1_000_000), fps=10)
+    base = np.zeros((7, 60, 3), dtype=np.uint8)
+    close = base.copy()
+    close[0, :3] = 255
+    far = base.copy()
+    far[0, :10] = 255
+
+    history = FrameHistory(threshold=5)
+    history.update("A", video.quantize(base))
+    assert not history.changed("A", video.quantize(close))
+    assert history.changed("A", video.quantize(far))
+    assert history.changed("B", video.quantize(base))
+    history.forget()
+    assert history.changed("A", video.quantize(base))
+    print("[OK] Frames within the pixel threshold count as unchanged")
+
+def test_frame_due_between_clock_reads():
+    # Every clock read moves time forward, like a busy machine
+    link = SimulatedLink(rate=1_000_000)
+    step = 0.03
+
+    def clock():
+        link.now += step
+        return link.now
+
+    def sleep(seconds):
+        # Same contract as time.sleep
+        if seconds < 0:
+            raise ValueError("sleep length must be non-negative")
+        link.now += seconds
+
+    video = Video(link, size=(60, 7), fps=10, clock=clock, sleep=sleep)
+    stats = video.play(frames(20))
+    assert stats["sent"] + stats["dropped"] == 20
+    print("[OK] Frames due between clock reads don't sleep a negative time")
+
+def test_throughput_estimate():
+    meter = Throughput()
+    assert meter.duration(100) == 0
+    meter.update(1000, 1.0)
+    meter.update(1000, 0.5)
+    assert 1000 < meter.rate < 2000
+    print("[OK] Throughput is smoothed")
+
+def main():
+    print("Video Pipeline Test")
+    print("=" * 40)
+    test_fast_link_sends_everything()
+    test_slow_link_drops_frames()
+    test_frames_are_fitted()
+    test_double_buffering()
+    test_unchanged_frames_are_skipped()
+    test_history_threshold()
+    test_frame_due_between_clock_reads()
+    test_throughput_estimate()
+    print("\nAll video tests passed!")
+
+if __name__ == '__main__':
+    main()